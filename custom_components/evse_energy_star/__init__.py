@@ -1,19 +1,49 @@
 import logging
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.storage import Store
 from .coordinator import EVSECoordinator
-from .const import DOMAIN
+from .scheduler import EVSEFleetScheduler
+from .allocator import EVSEFleetAllocator
+from .trace import EVSEReplayClient, read_trace
+from .services import async_setup_services
+from .const import DOMAIN, DEFAULT_UPDATE_RATE, DATA_SCHEDULER, DATA_ALLOCATOR, SNAPSHOT_STORE_VERSION, LIVE_OPTIONS
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "select", "button", "number", "switch", "time"]
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    # Сервіси рівня інтеграції — один раз на весь парк станцій
+    await async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data.get("host") or entry.options.get("host")
-    coordinator = EVSECoordinator(hass, host, entry)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    # Усі станції опитуються одним планувальником парку
+    scheduler = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_SCHEDULER] = EVSEFleetScheduler(hass)
+
+    # Станції на спільному вводі ділять ліміт струму між собою
+    allocator = domain_data.get(DATA_ALLOCATOR)
+    if allocator is None:
+        allocator = domain_data[DATA_ALLOCATOR] = EVSEFleetAllocator(hass)
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+    # 🎞️ Режим відтворення: замість мережі — записане трасування (опція replay_trace)
+    client = None
+    if replay_trace := entry.options.get("replay_trace"):
+        records = await hass.async_add_executor_job(read_trace, replay_trace)
+        client = EVSEReplayClient(hass, records, entry.options.get("replay_speed", 1.0))
+        _LOGGER.warning("__init__.py → %s: відтворення %s (%s записів)", host, replay_trace, len(records))
+
+    coordinator = EVSECoordinator(hass, host, entry, scheduler, client)
+
+    domain_data[entry.entry_id] = {
         "coordinator": coordinator,
         "host": host,
         "device_name_slug": coordinator.device_name_slug,  # ✅ одразу зберігаємо
@@ -23,26 +53,87 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "__init__.py → Створено coordinator для %s (%s), частота оновлення: %s сек",
         coordinator.device_name,
         host,
-        entry.options.get("update_rate", 10)
+        entry.options.get("update_rate", DEFAULT_UPDATE_RATE)
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Продовжуємо погодинну статистику енергії з місця зупинки
+    await coordinator.energy.async_load()
+    # ⚡ Є збережений знімок — сутності створюються одразу, перше опитування йде у фоні
+    if await coordinator.async_restore_snapshot():
+        # У планувальник — лише після першого опитування, інакше його перший тік
+        # опитає ту саму станцію паралельно з цим
+        async def _async_first_refresh() -> None:
+            await coordinator.async_refresh()
+            entry.async_on_unload(scheduler.async_register(coordinator))
+
+        entry.async_create_background_task(
+            hass, _async_first_refresh(), f"evse_energy_star first refresh {host}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+        entry.async_on_unload(scheduler.async_register(coordinator))
+    entry_data = domain_data[entry.entry_id]
+    entry_data["unsub_tunables"] = _start_tunables(coordinator, allocator, entry.options)
+    entry.async_on_unload(lambda: _stop_tunables(entry_data))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    async def _async_on_stop(event: Event) -> None:
+        # Буфер трасування дописуємо на диск, поки executor ще працює
+        if coordinator.client.recorder is not None:
+            await coordinator.client.recorder.async_close()
+        await coordinator.client.async_close()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_on_stop))
+
     return True
 
+def _start_tunables(coordinator: EVSECoordinator, allocator: EVSEFleetAllocator, options) -> list:
+    """Регулятор, планувальник і участь у групі вводу — те, що перезапускається зі зміною опцій."""
+    return [
+        coordinator.controller.async_start(),
+        coordinator.planner.async_start(),
+        allocator.async_register(coordinator, options),
+    ]
+
+def _stop_tunables(entry_data: dict) -> None:
+    for unsub in entry_data.pop("unsub_tunables", []):
+        unsub()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["coordinator"].async_shutdown()
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Прибираємо збережений знімок видаленої станції."""
+    await Store(hass, SNAPSHOT_STORE_VERSION, f"{DOMAIN}.snapshot.{entry.entry_id}").async_remove()
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload EVSE config entry when options are updated."""
-    _LOGGER.debug("update_listener → перезавантаження інтеграції через зміну опцій")
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Опції змінено: частоту, регулятор тощо застосовуємо на льоту, решта — перезавантаження."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_data is None:
+        return
+    coordinator = entry_data["coordinator"]
+    changed = {
+        key for key in coordinator.options.keys() | entry.options.keys()
+        if coordinator.options.get(key) != entry.options.get(key)
+    }
+    if not changed:
+        return
+    if changed - LIVE_OPTIONS:
+        _LOGGER.debug("update_listener → перезавантаження інтеграції через зміну %s", sorted(changed - LIVE_OPTIONS))
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("update_listener → застосування %s без перезавантаження", sorted(changed))
+    _stop_tunables(entry_data)
+    await coordinator.async_apply_options(entry.options)
+    entry_data["unsub_tunables"] = _start_tunables(coordinator, hass.data[DOMAIN][DATA_ALLOCATOR], entry.options)
+    coordinator.async_update_listeners()
@@ -0,0 +1,195 @@
+import logging
+import math
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from .const import (
+    CURRENT_MIN,
+    CURRENT_MAX,
+    ALLOCATION_STATES,
+    ALLOCATION_DRAW_MARGIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Member:
+    __slots__ = ("coordinator", "group", "limit", "priority", "phases", "unsub", "allocated", "sent")
+
+    def __init__(self, coordinator, options: dict):
+        self.coordinator = coordinator
+        self.group = options["supply_group"]
+        self.limit = options.get("supply_limit", CURRENT_MAX)
+        self.priority = options.get("supply_priority", 0)
+        # Однофазна станція навантажує лише свою фазу вводу
+        self.phases = (0, 1, 2) if coordinator.phase_count == 3 else (options.get("supply_phase", 1) - 1,)
+        self.unsub = None
+        self.allocated = None
+        # Остання надіслана уставка, поки станція її не підтвердила
+        self.sent = None
+
+    @property
+    def active(self) -> bool:
+        """Авто підключене і зарядка на станції не вимкнена (evseEnabled)."""
+        coordinator = self.coordinator
+        if coordinator.snapshot.state not in ALLOCATION_STATES:
+            return False
+        return str((coordinator.data or {}).get("evseEnabled", 1)).lower() not in ("0", "false")
+
+    def ceiling(self) -> int:
+        """Скільки має сенс дати станції: паспортний максимум або трохи понад фактичне споживання."""
+        snapshot = self.coordinator.snapshot
+        design = min(int(snapshot.curDesign or CURRENT_MAX), CURRENT_MAX)
+        if snapshot.state != "charging" or self.allocated is None:
+            return design
+        draws = [float(value) for value in (snapshot.curMeas1, snapshot.curMeas2, snapshot.curMeas3)
+                 if value is not None]
+        draw = max(draws, default=0.0)
+        # Струму ще немає (авто тільки розганяється) — тримаємо виділене
+        if draw < 1:
+            return self.allocated
+        # Авто бере помітно менше виділеного — решту віддаємо іншим;
+        # впирається в уставку — може взяти більше; посередині — без змін
+        if draw < self.allocated - ALLOCATION_DRAW_MARGIN:
+            return max(CURRENT_MIN, min(design, math.ceil(draw) + ALLOCATION_DRAW_MARGIN))
+        if draw >= self.allocated - 1:
+            return design
+        return self.allocated
+
+
+def allocate(members: list, limit: float) -> tuple[dict, float]:
+    """Розподіл струму (А на фазу) між станціями групи.
+
+    Кожна активна станція (авто підключене, зарядка не вимкнена) отримує
+    щонайменше CURRENT_MIN, далі залишок роздається по 1 А за колом — спершу
+    вищому пріоритету, в межах одного пріоритету порівну, поки дозволяють фази
+    та стеля станції. Неактивні станції в розподіл і бюджет не входять.
+    Повертає розподіл і найменший залишок по фазах (< 0 — мінімумів уже забагато).
+    """
+    headroom = [float(limit)] * 3
+    result = {}
+    active = [member for member in members if member.active]
+    for member in active:
+        for phase in member.phases:
+            headroom[phase] -= CURRENT_MIN
+        result[member] = CURRENT_MIN
+
+    ceilings = {member: member.ceiling() for member in active}
+    for priority in sorted({member.priority for member in active}, reverse=True):
+        level = [member for member in active if member.priority == priority]
+        progress = True
+        while progress:
+            progress = False
+            for member in level:
+                if result[member] >= ceilings[member]:
+                    continue
+                if any(headroom[phase] < 1 for phase in member.phases):
+                    continue
+                result[member] += 1
+                for phase in member.phases:
+                    headroom[phase] -= 1
+                progress = True
+    return result, min(headroom)
+
+
+class EVSEFleetAllocator:
+    """Спільний ліміт вводу для станцій однієї групи (supply_group в опціях).
+
+    Після кожного оновлення будь-якої станції групи розподіл перераховується
+    з фактичних curMeas* і state; на станції йдуть лише змінені уставки.
+    Якщо на станції ввімкнено регулятор за сенсором мережі, розподіл стає
+    його стелею замість прямого запису.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._members: dict[str, _Member] = {}
+        self.stats = {"rebalances": 0, "writes": 0, "over_budget": 0}
+
+    def _group(self, name: str) -> list[_Member]:
+        return [member for member in self._members.values() if member.group == name]
+
+    @callback
+    def async_register(self, coordinator, options: dict) -> CALLBACK_TYPE:
+        if not options.get("supply_group"):
+            return lambda: None
+        entry_id = coordinator.entry.entry_id
+        member = _Member(coordinator, options)
+        self._members[entry_id] = member
+        member.unsub = coordinator.async_add_listener(lambda: self._async_on_update(member))
+        _LOGGER.debug("allocator.py → %s у групі «%s», ліміт %s А, пріоритет %s",
+                      coordinator.device_name, member.group, member.limit, member.priority)
+
+        @callback
+        def _unregister() -> None:
+            member.unsub()
+            if self._members.get(entry_id) is member:
+                del self._members[entry_id]
+            self._async_rebalance(member.group)
+
+        return _unregister
+
+    @callback
+    def _async_on_update(self, member: _Member) -> None:
+        # Станція показує іншу уставку, і в черзі її вже немає — записати знову
+        if member.sent is not None and member.coordinator.snapshot.currentSet != member.sent \
+                and not member.coordinator.commands.depth:
+            member.sent = None
+        self._async_rebalance(member.group)
+
+    @callback
+    def _async_rebalance(self, group: str) -> None:
+        members = [member for member in self._group(group)
+                   if member.coordinator.last_update_success and not member.coordinator.stale]
+        if not members:
+            return
+        self.stats["rebalances"] += 1
+        # Найменший ліміт серед учасників — на випадок розбіжностей в опціях
+        limit = min(member.limit for member in members)
+        allocation, headroom = allocate(members, limit)
+        if headroom < 0:
+            self.stats["over_budget"] += 1
+            _LOGGER.warning("allocator.py → група «%s»: мінімальний струм усіх станцій перевищує ліміт %s А",
+                            group, limit)
+
+        for member in members:
+            if member not in allocation:
+                # Неактивній станції нічого не пишемо — уставка знадобиться, коли підключать авто
+                member.allocated = None
+        for member, value in allocation.items():
+            member.allocated = value
+            controller = member.coordinator.controller
+            if controller.enabled:
+                controller.set_ceiling(value)
+                continue
+            current = member.sent if member.sent is not None else member.coordinator.snapshot.currentSet
+            if current == value:
+                continue
+            member.sent = value
+            self.stats["writes"] += 1
+            _LOGGER.debug("allocator.py → %s: currentSet %s → %s А",
+                          member.coordinator.device_name, member.coordinator.snapshot.currentSet, value)
+            self.hass.async_create_background_task(
+                self._async_send(member, value), f"evse_energy_star allocator {member.coordinator.host}"
+            )
+
+    async def _async_send(self, member: _Member, value: int) -> None:
+        try:
+            result = await member.coordinator.commands.async_page_event("currentSet", value, refresh=False)
+            if result.superseded:
+                # Поки чекали в черзі, currentSet записав хтось інший — наступна оцінка врахує це
+                member.sent = None
+        except Exception as err:
+            member.sent = None
+            _LOGGER.warning("allocator.py → %s: не вдалося записати currentSet=%s: %s",
+                            member.coordinator.device_name, value, repr(err))
+
+    def group_dict(self, coordinator) -> dict | None:
+        member = self._members.get(coordinator.entry.entry_id)
+        if member is None:
+            return None
+        return {
+            "group": member.group,
+            "limit_a": member.limit,
+            "priority": member.priority,
+            "allocations": {m.coordinator.host: m.allocated for m in self._group(member.group)},
+            **self.stats,
+        }
@@ -0,0 +1,90 @@
+import logging
+import random
+import time
+from homeassistant.exceptions import HomeAssistantError
+from .const import BREAKER_THRESHOLD, BACKOFF_BASE, BACKOFF_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(HomeAssistantError):
+    """Станція вважається недоступною — запит не відправлявся."""
+
+
+class EVSECircuitBreaker:
+    """Запобіжник для недоступної станції.
+
+    Кожне невдале опитування подвоює паузу до наступного (з випадковим розкидом).
+    Після BREAKER_THRESHOLD невдач поспіль запобіжник розмикається: опитування
+    і команди не йдуть на станцію, доки не настане час пробного опитування.
+    Успішна проба замикає його і повертає звичайну частоту.
+    """
+
+    def __init__(self, name: str, threshold: int = BREAKER_THRESHOLD,
+                 base: float = BACKOFF_BASE, maximum: float = BACKOFF_MAX):
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._threshold = threshold
+        self._base = base
+        self._maximum = maximum
+        self._retry_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() < self._retry_at
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, round(self._retry_at - time.monotonic(), 1))
+
+    def allow_poll(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if time.monotonic() >= self._retry_at:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def backoff_delay(self) -> float:
+        if not self.failures:
+            return 0.0
+        cap = min(self._maximum, self._base * 2 ** (self.failures - 1))
+        # «Рівний» розкид: половина паузи гарантована, друга половина випадкова,
+        # щоб станції, що впали разом, не пробувались синхронно
+        return cap / 2 + random.random() * cap / 2
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            _LOGGER.info("breaker.py → %s знову доступна після %s невдалих спроб", self.name, self.failures)
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> float:
+        """Зафіксувати невдале опитування; повертає паузу до наступної спроби, сек."""
+        self.failures += 1
+        delay = self.backoff_delay()
+        if self.state == HALF_OPEN or self.failures >= self._threshold:
+            if self.state == CLOSED:
+                self.trips += 1
+                _LOGGER.warning(
+                    "breaker.py → %s недоступна (%s невдач поспіль), опитування призупинено",
+                    self.name, self.failures,
+                )
+            self.state = OPEN
+            self._retry_at = time.monotonic() + delay
+        return delay
+
+    @property
+    def summary(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in_s": self.retry_in if self.state == OPEN else None,
+        }
@@ -1,11 +1,12 @@
+import asyncio
 import logging
 from datetime import datetime
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,7 +22,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
 class SyncTimeButton(CoordinatorEntity, ButtonEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, slug: str):
-        super().__init__(coordinator)
+        # Кнопки не мають стану — оновлюються лише при зміні доступності
+        super().__init__(coordinator, context=frozenset())
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._attr_translation_key = "evse_energy_star_time_get"
@@ -44,11 +46,8 @@ class SyncTimeButton(CoordinatorEntity, ButtonEntity):
             system_time = local_ts + tz * 3600
             _LOGGER.debug("button.py → Синхронізація часу: systemTime=%s", system_time)
 
-            session = async_get_clientsession(self.coordinator.hass)
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data=f"systemTime={system_time}",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            await self.coordinator.commands.async_send(
+                "pageEvent", "systemTime", f"systemTime={system_time}", refresh=False
             )
 
         except Exception as err:
@@ -70,7 +69,8 @@ class SyncTimeButton(CoordinatorEntity, ButtonEntity):
 
 class ChargeNowButton(CoordinatorEntity, ButtonEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, slug: str):
-        super().__init__(coordinator)
+        # Кнопки не мають стану — оновлюються лише при зміні доступності
+        super().__init__(coordinator, context=frozenset())
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._attr_translation_key = "evse_energy_star_start_now"
@@ -81,59 +81,35 @@ class ChargeNowButton(CoordinatorEntity, ButtonEntity):
         self._attr_suggested_object_id = f"{slug}_{self._attr_translation_key}"
 
     async def async_press(self):
+        commands = self.coordinator.commands
         try:
-            data = self.coordinator.data
-            tz_raw = data.get("timeZone", 0)
-            try:
-                tz = int(float(str(tz_raw).strip()))
-            except Exception:
-                tz = 0
-                _LOGGER.warning("chargeNow → невірне значення timeZone: '%s'", tz_raw)
-
-            start = data.get("startTime", "23:00")
-            stop = data.get("stopTime", "07:00")
-            session = async_get_clientsession(self.coordinator.hass)
-
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data="oneCharge=0",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data="evseEnabled=1",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            # Черга зберігає порядок записів і сама оновить дані після останнього;
+            # розклад вимикається (час і пояс /timer лишаються як є) до самого chargeNow
+            *prepared, timer_result = await asyncio.gather(
+                commands.async_send("pageEvent", "oneCharge", "oneCharge=0"),
+                commands.async_send("pageEvent", "evseEnabled", "evseEnabled=1"),
+                self.coordinator.timer.async_update(isAlarm=False),
+                return_exceptions=True,
             )
-
-            payload_timer = f"isAlarm=false&startTime={start}&stopTime={stop}&timeZone={tz}"
-            await session.post(
-                f"http://{self.coordinator.host}/timer",
-                data=payload_timer,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            for result in prepared:
+                if isinstance(result, Exception):
+                    raise result
+            # Невдалий запис розкладу (напр. /timer ще невідомий) не скасовує зарядку
+            await asyncio.gather(
+                commands.async_send("pageEvent", "timeLimit", "timeLimit=500000"),
+                commands.async_send("pageEvent", "energyLimit", "energyLimit=10000"),
+                commands.async_send("pageEvent", "chargeNow", "chargeNow=12"),
             )
-            _LOGGER.debug("chargeNow → /timer: %s", payload_timer)
-
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data="timeLimit=500000",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data="energyLimit=10000",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            await session.post(
-                f"http://{self.coordinator.host}/pageEvent",
-                data="chargeNow=12",
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-
             _LOGGER.debug("chargeNow → Зарядка активована")
-
         except Exception as err:
             _LOGGER.error("chargeNow → помилка запиту: %s", repr(err))
+            raise HomeAssistantError(f"{self.coordinator.device_name}: не вдалося запустити зарядку: {err!r}") from err
+
+        if isinstance(timer_result, Exception):
+            _LOGGER.warning("chargeNow → зарядку запущено, але розклад не вимкнено: %s", repr(timer_result))
+            raise HomeAssistantError(
+                f"{self.coordinator.device_name}: зарядку запущено, але розклад не вимкнено: {timer_result}"
+            ) from timer_result
 
     @property
     def available(self):
@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import json as jsonlib
+import logging
+import time
+import aiohttp
+from typing import NamedTuple
+from homeassistant.core import HomeAssistant
+from .const import (
+    HTTP_CONNECTION_LIMIT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT_MIN,
+    HTTP_READ_TIMEOUT_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+class EVSEResponse(NamedTuple):
+    status: int
+    content_type: str
+    body: bytes
+
+    @property
+    def is_json(self) -> bool:
+        return self.status == 200 and "application/json" in self.content_type
+
+
+class EVSEClient:
+    """HTTP-клієнт однієї станції: постійна сесія з keep-alive пулом зʼєднань."""
+
+    def __init__(self, hass: HomeAssistant, host: str, limit_per_host: int = HTTP_CONNECTION_LIMIT):
+        self.hass = hass
+        self.host = host
+        self._limit_per_host = limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+        # Семафор планувальника парку: спільна межа одночасних запитів
+        self.limiter: asyncio.Semaphore | None = None
+        # Запис сирого трафіку (trace.py), якщо ввімкнено в опціях
+        self.recorder = None
+        # Згладжений час відповіді та його розкид, сек — для адаптивного тайм-ауту читання
+        self._srtt: float | None = None
+        self._rttvar = 0.0
+        # Інтервал опитування, сек: загальний тайм-аут запиту не довший за нього (ставить координатор)
+        self.poll_interval: float | None = None
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+        }
+
+    @property
+    def reuse_ratio(self) -> float | None:
+        total = self.stats["connections_created"] + self.stats["connections_reused"]
+        if not total:
+            return None
+        return round(self.stats["connections_reused"] / total, 3)
+
+    @property
+    def read_timeout(self) -> float:
+        if self._srtt is None:
+            return HTTP_READ_TIMEOUT_MAX
+        return min(HTTP_READ_TIMEOUT_MAX, max(HTTP_READ_TIMEOUT_MIN, self._srtt + 4 * self._rttvar))
+
+    def _observe_rtt(self, rtt: float) -> None:
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - rtt)
+            self._srtt = 0.875 * self._srtt + 0.125 * rtt
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+        return self._session
+
+    async def _on_connection_create(self, session, ctx, params):
+        self.stats["connections_created"] += 1
+
+    async def _on_connection_reuse(self, session, ctx, params):
+        self.stats["connections_reused"] += 1
+
+    @property
+    def total_timeout(self) -> float:
+        """Межа на весь запит: станція, що віддає тіло по байту, не тримає опитування вічно."""
+        total = HTTP_CONNECT_TIMEOUT + 2 * self.read_timeout
+        if self.poll_interval:
+            total = max(HTTP_READ_TIMEOUT_MIN, min(total, self.poll_interval))
+        return total
+
+    async def async_request(self, path: str, *, data=None, json=None, headers=None) -> EVSEResponse:
+        """POST на станцію; тіло відповіді читається повністю, щоб зʼєднання повернулось у пул."""
+        self.stats["requests"] += 1
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout, sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=self.read_timeout
+        )
+        try:
+            async with self.limiter or contextlib.nullcontext():
+                started = time.monotonic()
+                async with self._get_session().post(
+                    f"http://{self.host}/{path}", data=data, json=json, headers=headers, timeout=timeout
+                ) as resp:
+                    body = await resp.read()
+                self._observe_rtt(time.monotonic() - started)
+                response = EVSEResponse(resp.status, resp.headers.get("Content-Type", ""), body)
+        except Exception as err:
+            self.stats["errors"] += 1
+            if self.recorder is not None:
+                self.recorder.record(path, self._request_text(data, json), error=err)
+            raise
+        if self.recorder is not None:
+            self.recorder.record(path, self._request_text(data, json), response)
+        return response
+
+    @staticmethod
+    def _request_text(data, json_body) -> str | None:
+        if json_body is not None:
+            return jsonlib.dumps(json_body)
+        if isinstance(data, bytes):
+            return data.decode("utf-8", "replace")
+        return data
+
+    async def async_post_form(self, path: str, payload: str, headers: dict | None = None) -> EVSEResponse:
+        return await self.async_request(path, data=payload, headers={**FORM_HEADERS, **(headers or {})})
+
+    async def async_page_event(self, key: str, value) -> EVSEResponse:
+        _LOGGER.debug("client.py → /pageEvent %s=%s (%s)", key, value, self.host)
+        return await self.async_post_form("pageEvent", f"{key}={value}", {"pageEvent": key})
+
+    async def async_post_timer(self, payload: str) -> EVSEResponse:
+        _LOGGER.debug("client.py → /timer %s (%s)", payload, self.host)
+        return await self.async_post_form("timer", payload)
+
+    async def async_close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
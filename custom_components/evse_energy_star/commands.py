@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from homeassistant.core import CALLBACK_TYPE, callback
+from .breaker import CircuitOpenError
+from .client import EVSEResponse
+from .const import COMMAND_RATE_LIMIT, COMMAND_BURST
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Command:
+    path: str
+    payload: str
+    headers: dict | None
+    refresh: bool
+    future: asyncio.Future = field(repr=False)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class EVSECommandResult(NamedTuple):
+    """Результат запису: відповідь станції і те, що насправді пішло на станцію."""
+    response: EVSEResponse
+    payload: str
+    # Поки запис чекав у черзі, його замінив новіший для того ж ключа
+    superseded: bool
+
+    @property
+    def value(self) -> str:
+        """Записане значення з payload «key=value»."""
+        return self.payload.partition("=")[2]
+
+
+class EVSECommandQueue:
+    """Черга записів на одну станцію.
+
+    Записи йдуть по одному, з обмеженням частоти (token bucket). Повторний запис
+    того ж ключа, поки попередній ще в черзі, лише замінює значення — на станцію
+    піде тільки останнє. Після того як черга спорожніє, координатор один раз
+    оновлює дані.
+    """
+
+    def __init__(self, coordinator, rate: float = COMMAND_RATE_LIMIT, burst: int = COMMAND_BURST):
+        self.coordinator = coordinator
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._pending: dict[str, _Command] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._refresh_needed = False
+        self._depth_listeners: list = []
+        self.last_latency_ms = None
+        self.stats = {
+            "sent": 0,
+            "coalesced": 0,
+            "failed": 0,
+            "max_depth": 0,
+            "avg_latency_ms": None,
+        }
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @callback
+    def async_add_depth_listener(self, update_callback) -> CALLBACK_TYPE:
+        """Виклик при кожній зміні глибини черги; повертає функцію відписки."""
+        self._depth_listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._depth_listeners.remove(update_callback)
+
+        return _remove
+
+    def _notify_depth(self) -> None:
+        for update_callback in list(self._depth_listeners):
+            update_callback()
+
+    async def async_send(self, path: str, key: str, payload: str, headers: dict | None = None,
+                         refresh: bool = True) -> EVSECommandResult:
+        """Поставити запис у чергу і дочекатися, поки він (або новіший для того ж ключа) піде на станцію."""
+        queue_key = f"{path}:{key}"
+        command = self._pending.get(queue_key)
+        if command is not None:
+            _LOGGER.debug("commands.py → %s: %s замінено на %s", queue_key, command.payload, payload)
+            command.payload = payload
+            command.headers = headers
+            command.refresh = command.refresh or refresh
+            self.stats["coalesced"] += 1
+        else:
+            command = _Command(path, payload, headers, refresh, asyncio.get_running_loop().create_future())
+            self._pending[queue_key] = command
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._pending))
+            self._notify_depth()
+
+        self._ensure_worker()
+        self._wakeup.set()
+        # Майбутнє отримує payload, який справді пішов на станцію
+        resp, sent = await asyncio.shield(command.future)
+        return EVSECommandResult(resp, sent, sent != payload)
+
+    async def async_page_event(self, key: str, value, refresh: bool = True) -> EVSECommandResult:
+        return await self.async_send("pageEvent", key, f"{key}={value}", {"pageEvent": key}, refresh)
+
+    async def async_post_timer(self, payload: str, refresh: bool = True) -> EVSECommandResult:
+        return await self.async_send("timer", "timer", payload, None, refresh)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = self.coordinator.hass.async_create_background_task(
+                self._async_run(), f"evse_energy_star command queue {self.coordinator.host}"
+            )
+
+    async def _async_take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def _async_run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._pending:
+                await self._async_take_token()
+                queue_key = next(iter(self._pending))
+                command = self._pending.pop(queue_key)
+                self._notify_depth()
+                # Станція недоступна — не чекаємо тайм-ауту, одразу повертаємо помилку
+                if self.coordinator.breaker.is_open:
+                    self.stats["failed"] += 1
+                    if not command.future.done():
+                        command.future.set_exception(CircuitOpenError(
+                            f"{self.coordinator.device_name}: станція недоступна, "
+                            f"повтор через {self.coordinator.breaker.retry_in} сек"
+                        ))
+                    continue
+                started = time.monotonic()
+                try:
+                    resp = await self.coordinator.client.async_post_form(
+                        command.path, command.payload, command.headers
+                    )
+                except Exception as err:
+                    self.stats["failed"] += 1
+                    _LOGGER.error("commands.py → помилка запису %s → %s", command.payload, repr(err))
+                    if not command.future.done():
+                        command.future.set_exception(err)
+                    continue
+                finally:
+                    self._record_latency(queue_key, started)
+
+                self.stats["sent"] += 1
+                self._refresh_needed = self._refresh_needed or command.refresh
+                if not command.future.done():
+                    command.future.set_result((resp, command.payload))
+
+            if self._refresh_needed:
+                self._refresh_needed = False
+                await self.coordinator.async_request_full_refresh()
+
+    def _record_latency(self, queue_key: str, started: float) -> None:
+        latency = round((time.monotonic() - started) * 1000, 1)
+        self.last_latency_ms = latency
+        self.coordinator.metrics.observe(f"write:{queue_key}", latency)
+        avg = self.stats["avg_latency_ms"]
+        self.stats["avg_latency_ms"] = latency if avg is None else round(avg * 0.8 + latency * 0.2, 1)
+
+    async def async_shutdown(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for command in self._pending.values():
+            if not command.future.done():
+                command.future.cancel()
+        self._pending.clear()
+        self._notify_depth()
@@ -19,3 +19,136 @@ STATUS_MAP = {
     21: "plug_overheat",
     22: "undervoltage",
 }
+
+# HTTP-клієнт станції: скільки одночасних зʼєднань тримати на один хост
+# (вбудований веб-сервер ESP погано переносить більше 2) і скільки секунд
+# тримати простійне keep-alive зʼєднання у пулі
+HTTP_CONNECTION_LIMIT = 2
+HTTP_KEEPALIVE_TIMEOUT = 30
+
+# Як часто (сек) перечитувати /init — повільні налаштування станції
+# (fwVersion, timeZone, startTime/stopTime, curDesign). 0 — щоциклу.
+DEFAULT_INIT_REFRESH_RATE = 300
+
+# Адаптивне опитування: швидко під час зарядки та аварій, повільно в очікуванні
+FAST_POLL_STATES = {
+    "charging",
+    "overcurrent",
+    "overvoltage",
+    "leakage",
+    "station_error",
+    "overtemperature",
+    "no_ground",
+    "plug_overheat",
+    "undervoltage",
+}
+SLOW_POLL_STATES = {"waiting", "ready", "delayed_start"}
+DEFAULT_UPDATE_RATE = 10
+DEFAULT_IDLE_UPDATE_RATE = 30
+# Скільки секунд після команди тримати швидку частоту
+COMMAND_BOOST_SECONDS = 60
+
+# Черга команд: не більше COMMAND_RATE_LIMIT записів/сек у середньому
+# і до COMMAND_BURST записів підряд
+COMMAND_RATE_LIMIT = 4
+COMMAND_BURST = 4
+
+# Перевірка після запису: VERIFY_ATTEMPTS читань з паузою VERIFY_DELAY, що подвоюється
+VERIFY_ATTEMPTS = 4
+VERIFY_DELAY = 0.5
+
+# Спільний планувальник парку станцій: ключ у hass.data[DOMAIN] і
+# максимум одночасних HTTP-запитів на всі станції разом
+DATA_SCHEDULER = "fleet_scheduler"
+FLEET_MAX_CONCURRENCY = 8
+
+# Скільки останніх вимірів затримки тримати для перцентилів
+METRICS_WINDOW = 500
+
+# Тайм-аути одного запиту: зʼєднання — фіксований, читання — адаптивний
+# (згладжений RTT + 4 відхилення, як RTO у TCP) у межах MIN…MAX
+HTTP_CONNECT_TIMEOUT = 3
+HTTP_READ_TIMEOUT_MIN = 2
+HTTP_READ_TIMEOUT_MAX = 15
+
+# Недоступна станція: пауза BACKOFF_BASE·2ⁿ (до BACKOFF_MAX) між спробами,
+# після BREAKER_THRESHOLD невдач поспіль — лише пробні опитування
+BREAKER_THRESHOLD = 3
+BACKOFF_BASE = 5
+BACKOFF_MAX = 300
+
+# Швидкі вимірювання, що зберігаються в памʼяті з повною роздільністю
+SAMPLE_KEYS = (
+    "curMeas1", "curMeas2", "curMeas3",
+    "voltMeas1", "voltMeas2", "voltMeas3",
+    "temperature1", "temperature2", "leakValue",
+)
+# Ємність кільцевого буфера (година при опитуванні щосекунди), вікно агрегатів, сек
+SAMPLE_CAPACITY = 3600
+SAMPLE_WINDOW = 60
+
+# Фільтри публікації вимірювань, за групами (клас пристрою сенсора):
+# (мертва зона — абсолютна «2» або відносна «2%», мін. і макс. інтервал публікації, сек)
+# Макс. інтервал 0 — не публікувати примусово значення в межах мертвої зони
+PUBLISH_FILTER_DEFAULTS = {
+    "current": ("0.1", 0, 300),
+    "voltage": ("2", 10, 300),
+    "temperature": ("0.5", 30, 600),
+    "leakage": ("0.5", 10, 600),
+}
+
+# Локальне інтегрування енергії: розрив між вимірами, після якого інтеграл
+# години вважається неповним (сек), і роздільність лічильника totalEnergy (кВт·год)
+ENERGY_MAX_GAP = 300
+ENERGY_COUNTER_RESOLUTION = 0.1
+
+# Межі струму заряду, А
+CURRENT_MIN = 6
+CURRENT_MAX = 32
+
+# Регулятор струму за лічильником мережі:
+# запас ліміту вводу за замовчуванням (А), номінальна напруга для перерахунку Вт → А,
+# гістерезис підвищення (А), мін. час на рівні перед підвищенням і мін. пауза між записами (сек)
+DEFAULT_GRID_LIMIT = 25
+NOMINAL_VOLTAGE = 230
+CONTROLLER_HYSTERESIS = 1
+CONTROLLER_DWELL = 10
+CONTROLLER_MIN_INTERVAL = 2
+
+# Розподіл струму між станціями на спільному вводі
+DATA_ALLOCATOR = "fleet_allocator"
+# Стани, у яких станції резервується хоча б мінімальний струм (авто підключене)
+ALLOCATION_STATES = {"charging", "ready", "delayed_start"}
+# Запас над фактичним споживанням для авто, що бере менше виділеного, А
+ALLOCATION_DRAW_MARGIN = 2
+
+# Останній вдалий знімок станції на диску: старт без очікування першого опитування
+SNAPSHOT_STORE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+
+# Запис сирого трафіку станції (opt-in): розмір файлу до ротації, скільки старих тримати,
+# як часто скидати буфер на диск, сек
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUPS = 3
+TRACE_FLUSH_INTERVAL = 10
+
+# /timer: скільки чекати подальших правок перед одним спільним записом, сек
+TIMER_DEBOUNCE = 0.3
+
+# Планувальник зарядки за тарифом: атрибут прогнозу цін і цільова енергія за замовчуванням (кВт·год)
+DEFAULT_PRICE_ATTRIBUTE = "prices"
+DEFAULT_TARGET_ENERGY = 20
+
+# Сервіс apply_settings: скільки станцій налаштовуються одночасно
+APPLY_MAX_CONCURRENCY = 8
+
+# Опції, що застосовуються на льоту; зміна будь-якої іншої (host, device_type, …) — перезавантаження запису
+LIVE_OPTIONS = frozenset({
+    "update_rate", "init_refresh_rate", "adaptive_polling", "idle_update_rate",
+    "grid_sensor", "grid_limit",
+    "supply_group", "supply_limit", "supply_priority", "supply_phase",
+    "price_sensor", "price_attribute", "target_energy",
+    "trace",
+    *(f"{group}_{field}" for group in PUBLISH_FILTER_DEFAULTS
+      for field in ("deadband", "min_interval", "max_interval")),
+})
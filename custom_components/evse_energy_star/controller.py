@@ -0,0 +1,180 @@
+import logging
+import math
+import time
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from .const import (
+    CURRENT_MIN,
+    CURRENT_MAX,
+    DEFAULT_GRID_LIMIT,
+    NOMINAL_VOLTAGE,
+    CONTROLLER_HYSTERESIS,
+    CONTROLLER_DWELL,
+    CONTROLLER_MIN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+POWER_UNITS = {"W": 1, "kW": 1000}
+
+
+class EVSECurrentController:
+    """Регулятор currentSet за сенсором мережі (потужність або струм вводу).
+
+    Працює від подій зміни стану сенсора, без автоматизацій і шаблонів.
+    Дозволений струм = ліміт вводу − споживання будинку без станції,
+    у межах 6 А … curDesign (32 А). Зниження — одразу, підвищення — лише з
+    запасом CONTROLLER_HYSTERESIS А понад новий рівень і після
+    CONTROLLER_DWELL сек на поточному рівні.
+    Записи йдуть через чергу команд без повного оновлення після кожного.
+    """
+
+    def __init__(self, coordinator, options: dict):
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.sensor = options.get("grid_sensor") or None
+        self.limit = options.get("grid_limit", DEFAULT_GRID_LIMIT)
+        self.target = None
+        # Стеля від розподілу струму між станціями (allocator.py), якщо є
+        self.ceiling = None
+        self._changed_at = 0.0
+        self._written_at = 0.0
+        self._unsub_retry = None
+        self.stats = {"events": 0, "writes": 0, "skipped": 0, "last_reaction_ms": None}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sensor is not None
+
+    @callback
+    def async_start(self):
+        """Підписка на сенсор мережі; повертає функцію відписки."""
+        if not self.enabled:
+            return lambda: None
+        _LOGGER.info("controller.py → %s: регулювання струму за %s, ліміт %s А",
+                     self.coordinator.device_name, self.sensor, self.limit)
+        unsub = async_track_state_change_event(self.hass, [self.sensor], self._async_on_change)
+
+        @callback
+        def _stop() -> None:
+            unsub()
+            self._cancel_retry()
+
+        return _stop
+
+    def _cancel_retry(self) -> None:
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    def _grid_current(self, state) -> float | None:
+        """Струм вводу (А на фазу, імпорт > 0) зі стану сенсора мережі."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        factor = POWER_UNITS.get(state.attributes.get("unit_of_measurement"))
+        if factor is None:
+            return value
+        voltage = self.coordinator.snapshot.voltMeas1 or NOMINAL_VOLTAGE
+        return value * factor / (float(voltage) * self.coordinator.phase_count)
+
+    def _headroom(self, grid_current: float) -> float:
+        """Скільки ампер можна дати станції — без округлення."""
+        ev_current = float(self.coordinator.snapshot.curMeas1 or 0)
+        # Сенсор мережі бачить і саму станцію — її струм повертаємо в запас
+        return self.limit - grid_current + ev_current
+
+    def _allowed(self, headroom: float) -> int:
+        design = self.coordinator.snapshot.curDesign or CURRENT_MAX
+        upper = min(int(design), CURRENT_MAX, self.ceiling or CURRENT_MAX)
+        return max(CURRENT_MIN, min(upper, math.floor(headroom)))
+
+    @callback
+    def set_ceiling(self, value: int) -> None:
+        if value != self.ceiling:
+            self.ceiling = value
+            self._evaluate(time.monotonic())
+
+    @callback
+    def _async_on_change(self, event: Event) -> None:
+        self.stats["events"] += 1
+        self._evaluate(time.monotonic())
+
+    @callback
+    def _async_retry(self, _now) -> None:
+        self._unsub_retry = None
+        self._evaluate(time.monotonic())
+
+    def _evaluate(self, started: float) -> None:
+        if not self.coordinator.last_update_success or self.coordinator.stale:
+            return
+        grid_current = self._grid_current(self.hass.states.get(self.sensor))
+        if grid_current is None:
+            return
+
+        headroom = self._headroom(grid_current)
+        allowed = self._allowed(headroom)
+        current = self.target if self.target is not None else self.coordinator.snapshot.currentSet
+        now = time.monotonic()
+
+        if current is not None:
+            if allowed == current:
+                return
+            if allowed > current:
+                # Гістерезис віднімаємо до округлення: при уставці 16 А запас 17.3 А
+                # ще не підіймає, інакше кожне коливання на ±0.5 А давало б запис
+                allowed = self._allowed(headroom - CONTROLLER_HYSTERESIS)
+                if allowed <= current:
+                    return
+                dwell_left = CONTROLLER_DWELL - (now - self._changed_at)
+                if dwell_left > 0:
+                    self._schedule_retry(dwell_left)
+                    return
+
+        wait = CONTROLLER_MIN_INTERVAL - (now - self._written_at)
+        if wait > 0:
+            self.stats["skipped"] += 1
+            self._schedule_retry(wait)
+            return
+
+        self._write(allowed, now, started)
+
+    def _schedule_retry(self, delay: float) -> None:
+        if self._unsub_retry is None:
+            self._unsub_retry = async_call_later(self.hass, delay, self._async_retry)
+
+    def _write(self, value: int, now: float, started: float) -> None:
+        _LOGGER.debug("controller.py → %s: currentSet %s → %s А",
+                      self.coordinator.device_name, self.target, value)
+        self.target = value
+        self._changed_at = self._written_at = now
+        self.stats["writes"] += 1
+        self.stats["last_reaction_ms"] = round((now - started) * 1000, 2)
+        self.hass.async_create_background_task(
+            self._async_send(value), f"evse_energy_star current controller {self.coordinator.host}"
+        )
+
+    async def _async_send(self, value: int) -> None:
+        try:
+            result = await self.coordinator.commands.async_page_event("currentSet", value, refresh=False)
+            if result.superseded:
+                # Поки чекали в черзі, currentSet записав хтось інший — наступна оцінка врахує це
+                self.target = None
+        except Exception as err:
+            # Наступна подія сенсора спробує знову
+            self.target = None
+            _LOGGER.warning("controller.py → %s: не вдалося записати currentSet=%s: %s",
+                            self.coordinator.device_name, value, repr(err))
+
+    def as_dict(self) -> dict:
+        return {
+            "sensor": self.sensor,
+            "limit_a": self.limit,
+            "target_a": self.target,
+            "ceiling_a": self.ceiling,
+            **self.stats,
+        }
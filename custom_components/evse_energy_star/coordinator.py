@@ -1,25 +1,91 @@
+import asyncio
 import logging
+import time
 import aiohttp
-import async_timeout
-from datetime import timedelta
+from datetime import datetime, timedelta
 from homeassistant.util import slugify
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.core import HomeAssistant
+from homeassistant.util.json import json_loads
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN
+from .breaker import EVSECircuitBreaker
+from .client import EVSEClient
+from .commands import EVSECommandQueue
+from .controller import EVSECurrentController
+from .planner import EVSETariffPlanner
+from .energy import EVSEEnergyIntegrator
+from .metrics import EVSEMetrics
+from .samples import EVSESampleBuffer
+from .schedule import EVSETimerState
+from .snapshot import EVSESnapshot
+from .trace import EVSETraceRecorder
+from .const import (
+    DOMAIN,
+    STATUS_MAP,
+    DEFAULT_INIT_REFRESH_RATE,
+    DEFAULT_UPDATE_RATE,
+    DEFAULT_IDLE_UPDATE_RATE,
+    FAST_POLL_STATES,
+    SLOW_POLL_STATES,
+    COMMAND_BOOST_SECONDS,
+    VERIFY_ATTEMPTS,
+    VERIFY_DELAY,
+    SNAPSHOT_STORE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _values_match(actual, expected) -> bool:
+    """Порівняння значення зі станції з записаним: 16 == "16.0", true == "1"."""
+    if actual is None:
+        return False
+    try:
+        return float(actual) == float(expected)
+    except (TypeError, ValueError):
+        pass
+    truthy = {"true", "1"}
+    actual_str, expected_str = str(actual).lower(), str(expected).lower()
+    if actual_str in truthy | {"false", "0"} and expected_str in truthy | {"false", "0"}:
+        return (actual_str in truthy) == (expected_str in truthy)
+    return actual_str == expected_str
+
+
+def _system_time_close(old, new) -> bool:
+    """systemTime іде щосекунди — зміною вважаємо лише відхилення понад 2 с."""
+    try:
+        fmt = "%H:%M:%S"
+        delta = datetime.strptime(str(new), fmt) - datetime.strptime(str(old), fmt)
+        return abs(delta.total_seconds()) <= 2
+    except ValueError:
+        try:
+            return abs(float(new) - float(old)) <= 2
+        except (TypeError, ValueError):
+            return False
+
+
+# Ключі, для яких «не змінилось» означає «в межах допуску», а не рівність
+CHANGE_TOLERANCES = {
+    "systemTime": _system_time_close,
+}
+
+
 class EVSECoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, host: str, entry: ConfigEntry):
-        update_rate = entry.options.get("update_rate", 10)
+    def __init__(self, hass: HomeAssistant, host: str, entry: ConfigEntry, scheduler=None, client=None):
+        update_rate = entry.options.get("update_rate", DEFAULT_UPDATE_RATE)
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN} Coordinator",
-            update_interval=timedelta(seconds=update_rate),
+            # Зі спільним планувальником власний таймер координатора не потрібен
+            update_interval=None if scheduler else timedelta(seconds=update_rate),
         )
         self.hass = hass
+        self.scheduler = scheduler
+        self._interval = update_rate
         self.host = host
         self.entry = entry
 
@@ -32,49 +98,400 @@ class EVSECoordinator(DataUpdateCoordinator):
         # Одразу зберігаємо slug, щоб уникнути дублювання коду в сутностях
         self.device_name_slug = slugify(self.device_name)
 
-    async def _async_update_data(self):
+        # Один клієнт на станцію: координатор і всі платформи ходять через нього
+        # (або EVSEReplayClient — відтворення записаного трасування)
+        self.client = client or EVSEClient(hass, host)
+        if scheduler is not None:
+            self.client.limiter = scheduler.limiter
+        self.client.poll_interval = update_rate
+        # 🎞️ Запис сирого трафіку в config/evse_energy_star_trace_<slug>.jsonl.gz
+        if entry.options.get("trace"):
+            self.client.recorder = self._make_recorder()
+        # Усі записи (/pageEvent, /timer) — через чергу команд
+        self.commands = EVSECommandQueue(self)
+        # /timer (розклад, часовий пояс) — лише через один обʼєкт із замком
+        self.timer = EVSETimerState(self)
+        # Затримки, лічильники помилок, вік останнього успішного опитування
+        self.metrics = EVSEMetrics()
+        # Запобіжник і експоненційна пауза для недоступної станції
+        self.breaker = EVSECircuitBreaker(self.device_name)
+
+        # /init (конфігурація) опитується рідше за /main (вимірювання):
+        # кешуємо останній результат і домішуємо його до кожного циклу
+        self.init_refresh_rate = entry.options.get("init_refresh_rate", DEFAULT_INIT_REFRESH_RATE)
+        self._init_cache = {}
+        self._init_fetched_at = None
+        self._init_requested = True
+
+        # Адаптивна частота: update_rate — швидка межа, idle_update_rate — повільна
+        self.update_rate = update_rate
+        self.idle_update_rate = max(update_rate, entry.options.get("idle_update_rate", DEFAULT_IDLE_UPDATE_RATE))
+        self.adaptive_polling = entry.options.get("adaptive_polling", True)
+        self._boost_until = 0.0
+
+        # Розсилка лише за змінами: останні опубліковані значення та ключі,
+        # що змінились у поточному оновленні
+        self._published = {}
+        self._published_success = None
+        self.changed_keys = set()
+        # Останнє сире тіло й розібраний словник по ендпоінтах; _skip_diff — цикл без змін
+        self._raw: dict[str, tuple[bytes, dict]] = {}
+        self._skip_diff = False
+        # Декодований стан: перетворюємо лише змінені ключі, сутності читають готове
+        self.snapshot = EVSESnapshot()
+        # Швидкі вимірювання з повною роздільністю та хвилинні агрегати
+        self.samples = EVSESampleBuffer()
+        # Погодинна енергія з I×U → зовнішня статистика recorder
+        self.energy = EVSEEnergyIntegrator(hass, self.device_name, self.device_name_slug)
+        # Регулятор струму за сенсором мережі (якщо вибрано в опціях)
+        self.controller = EVSECurrentController(self, entry.options)
+        # Найдешевше вікно зарядки за прогнозом цін (якщо вибрано сенсор цін)
+        self.planner = EVSETariffPlanner(self, entry.options)
+
+        # Останній вдалий знімок на диску; stale — сутності показують збережене, а не живе
+        self._store = Store(hass, SNAPSHOT_STORE_VERSION, f"{DOMAIN}.snapshot.{entry.entry_id}")
+        self.stale = False
+        self.capabilities = {}
+
+        # Опції, з якими працює координатор; options_generation — сутності перечитують свої
+        self.options = dict(entry.options)
+        self.options_generation = 0
+
+    def _make_recorder(self) -> EVSETraceRecorder:
+        return EVSETraceRecorder(
+            self.hass, self.hass.config.path(f"{DOMAIN}_trace_{self.device_name_slug}.jsonl.gz")
+        )
+
+    async def async_apply_options(self, options: dict) -> None:
+        """Застосувати змінені опції на льоту, без перезавантаження запису.
+
+        Регулятор і планувальник перестворюються з нових опцій; запускає їх __init__.py.
+        """
+        self.options = dict(options)
+        self.options_generation += 1
+
+        self.update_rate = options.get("update_rate", DEFAULT_UPDATE_RATE)
+        self.idle_update_rate = max(self.update_rate, options.get("idle_update_rate", DEFAULT_IDLE_UPDATE_RATE))
+        self.adaptive_polling = options.get("adaptive_polling", True)
+        self.init_refresh_rate = options.get("init_refresh_rate", DEFAULT_INIT_REFRESH_RATE)
+        self.client.poll_interval = self.update_rate
+        self._set_interval(self._select_interval(self.data or {}))
+        if self.scheduler is not None:
+            self.scheduler.async_reschedule(self)
+
+        if options.get("trace") and self.client.recorder is None:
+            self.client.recorder = self._make_recorder()
+        elif not options.get("trace") and self.client.recorder is not None:
+            recorder, self.client.recorder = self.client.recorder, None
+            await recorder.async_close()
+
+        self.controller = EVSECurrentController(self, options)
+        self.planner = EVSETariffPlanner(self, options)
+        _LOGGER.info("EVSECoordinator → %s: опції застосовано без перезавантаження, опитування кожні %s сек",
+                     self.device_name, self.update_rate)
+
+    @property
+    def phase_count(self) -> int:
+        """Кількість фаз станції з налаштованого device_type — одна для всіх розрахунків струму й потужності."""
+        device_type = self.options.get("device_type", self.entry.data.get("device_type", "1_phase"))
+        return 3 if device_type == "3_phase" else 1
+
+    @property
+    def effective_interval(self) -> float:
+        """Поточний інтервал опитування, сек."""
+        return self._interval
+
+    def _set_interval(self, seconds: int) -> None:
+        self._interval = seconds
+        if self.scheduler is None:
+            self.update_interval = timedelta(seconds=seconds)
+
+    @property
+    def poll_lag_ms(self):
+        return self.scheduler.member_stats(self)[0] if self.scheduler else None
+
+    @property
+    def poll_duration_ms(self):
+        return self.scheduler.member_stats(self)[1] if self.scheduler else None
+
+    def boost_polling(self) -> None:
+        """Після команди — одразу на швидку частоту на COMMAND_BOOST_SECONDS."""
+        self._boost_until = time.monotonic() + COMMAND_BOOST_SECONDS
+        self._set_interval(self.update_rate)
+        if self.scheduler is not None:
+            self.scheduler.async_reschedule(self)
+
+    def _select_interval(self, data: dict) -> int:
+        if not self.adaptive_polling or time.monotonic() < self._boost_until:
+            return self.update_rate
+        state = STATUS_MAP.get(data.get("state"), "unknown")
+        if state in FAST_POLL_STATES:
+            return self.update_rate
+        if state in SLOW_POLL_STATES:
+            return self.idle_update_rate
+        return self.update_rate
+
+    def request_init_refresh(self) -> None:
+        """Позначити /init до оновлення в наступному циклі."""
+        self._init_requested = True
+
+    async def async_request_full_refresh(self) -> None:
+        """Оновлення після запису: /init і /main у найближчому циклі."""
+        self.request_init_refresh()
+        self.boost_polling()
+        await self.async_request_refresh()
+
+    def _init_due(self) -> bool:
+        if self._init_requested or self._init_fetched_at is None:
+            return True
+        return time.monotonic() - self._init_fetched_at >= self.init_refresh_rate
+
+    def _compute_changed_keys(self, data: dict) -> set:
+        changed = set()
+        for key in self._published.keys() - data.keys():
+            changed.add(key)
+            del self._published[key]
+        for key, value in data.items():
+            if key in self._published:
+                old = self._published[key]
+                if old == value:
+                    continue
+                tolerance = CHANGE_TOLERANCES.get(key)
+                if tolerance is not None and tolerance(old, value):
+                    continue
+            self._published[key] = value
+            changed.add(key)
+        return changed
+
+    async def async_restore_snapshot(self) -> bool:
+        """Підхопити збережений знімок, щоб створити сутності без очікування станції."""
+        stored = await self._store.async_load()
+        if not stored or not stored.get("data"):
+            return False
+        data = stored["data"]
+        self.capabilities = stored.get("capabilities", {})
+        self.data = data
+        self.changed_keys = self._compute_changed_keys(data)
+        self.snapshot.update(data, self.changed_keys)
+        self.stale = True
+        _LOGGER.info("EVSECoordinator → %s: відновлено знімок від %s", self.device_name, stored.get("saved_at"))
+        return True
+
+    def _snapshot_to_store(self) -> dict:
+        return {
+            "saved_at": datetime.now().isoformat(),
+            "capabilities": self.capabilities,
+            "data": self.data,
+        }
+
+    def _detect_capabilities(self, data: dict) -> dict:
+        return {
+            "fwVersion": data.get("fwVersion"),
+            "curDesign": data.get("curDesign"),
+            "phases": 3 if data.get("curMeas2") is not None or data.get("curMeas3") is not None else 1,
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Оновлюємо лише сутності, чиї ключі (context) змінились.
+
+        Сутності без context оновлюються завжди; зміна доступності — теж для всіх.
+        """
+        availability_changed = self.last_update_success != self._published_success
+        self._published_success = self.last_update_success
+        if self._skip_diff and self.last_update_success:
+            self.changed_keys = set()
+        else:
+            self.changed_keys = self._compute_changed_keys(self.data or {})
+            self.snapshot.update(self.data or {}, self.changed_keys)
+        self._skip_diff = False
+        if self.last_update_success and self.data:
+            # 📈 Кожен вимір — у кільцевий буфер, навіть якщо значення не змінилось
+            now = time.monotonic()
+            self.samples.record(self.snapshot, now)
+            self.energy.record(self.snapshot, now)
+
+        if not availability_changed and not self.changed_keys:
+            _LOGGER.debug("EVSECoordinator → змін немає, оновлюються лише сутності без ключів")
+
+        for update_callback, context in list(self._listeners.values()):
+            if availability_changed or context is None or not context.isdisjoint(self.changed_keys):
+                update_callback()
+
+    async def async_verify(self, key: str, expected) -> bool:
+        """Перевірка після запису: читаємо лише той ендпоінт, де живе key, з backoff."""
+        return not await self.async_verify_many({key: expected})
+
+    async def async_verify_many(self, expected: dict) -> set:
+        """Перевірка кількох записів: одне читання на ендпоінт за спробу, з backoff.
+
+        Ключі, що є в /main, перевіряються через /main (при злитті /main важливіший);
+        /init читається лише для ключів, яких у /main немає.
+        Успішне читання одразу потрапляє в coordinator.data. Повертає непідтверджені ключі.
+        """
+        pending = dict(expected)
+        delay = VERIFY_DELAY
+        for attempt in range(1, VERIFY_ATTEMPTS + 1):
+            await asyncio.sleep(delay)
+            delay *= 2
+            main = self._raw.get("main", (None, {}))[1]
+            endpoints = {
+                "init" if key not in main and key in self._init_cache else "main" for key in pending
+            }
+            for endpoint in sorted(endpoints, reverse=True):
+                kwargs = {} if endpoint == "init" else {"json": {"getState": True}}
+                data = await self._async_fetch(endpoint, **kwargs)
+                if data is None:
+                    continue
+                if endpoint == "init":
+                    self._init_cache = data
+                    self._init_fetched_at = time.monotonic()
+                    main = self._raw.get("main", (None, {}))[1]
+                    merged = {**(self.data or {}), **data, **main}
+                else:
+                    merged = {**(self.data or {}), **data}
+                self.async_set_updated_data(merged)
+                for key in [key for key in pending if key in data]:
+                    if _values_match(data.get(key), pending[key]):
+                        _LOGGER.debug("EVSECoordinator → %s=%s підтверджено (спроба %s)", key, pending.pop(key), attempt)
+            if not pending:
+                return set()
+        for key, value in pending.items():
+            _LOGGER.warning("EVSECoordinator → %s=%s не підтверджено після %s спроб", key, value, VERIFY_ATTEMPTS)
+        return set(pending)
+
+    async def async_fetch_init(self) -> dict | None:
+        """Одне читання /init поза циклом опитування; результат одразу йде в coordinator.data."""
+        data = await self._async_fetch("init")
+        if data is None:
+            return None
+        self._init_cache = data
+        self._init_fetched_at = time.monotonic()
+        # Спільні з /main ключі лишаються з /main — як і в циклі опитування
+        self.async_set_updated_data({**(self.data or {}), **data, **self._raw.get("main", (None, {}))[1]})
+        return data
+
+    async def async_write_verified(self, key: str, expected, write) -> bool:
+        """Виконати запис (корутина write) і дочекатися, поки станція покаже key == записаному.
+
+        Якщо запис у черзі замінив новіший для того ж ключа, повертає False без перевірки:
+        перевіряє той, чиє значення пішло на станцію.
+        """
+        self.boost_polling()
         try:
-            async with async_timeout.timeout(35):
-                async with aiohttp.ClientSession() as session:
-
-                    # 🟡 КРОК 1: POST /init
-                    init_url = f"http://{self.host}/init"
-                    _LOGGER.debug("EVSECoordinator → POST /init: %s", init_url)
-
-                    init_data = {}
-                    try:
-                        async with session.post(init_url) as resp_init:
-                            if resp_init.status == 200 and "application/json" in resp_init.headers.get("Content-Type", ""):
-                                init_data = await resp_init.json()
-                                _LOGGER.debug("EVSECoordinator → Дані з /init:")
-                                for key, value in init_data.items():
-                                    _LOGGER.debug("  %s → %s (%s)", key, value, type(value).__name__)
-                            else:
-                                _LOGGER.warning("EVSECoordinator → /init → не JSON (%s)", resp_init.headers.get("Content-Type"))
-                    except Exception as err:
-                        _LOGGER.error("EVSECoordinator → помилка запиту /init: %s", repr(err))
-
-                    # 🟢 КРОК 2: POST /main
-                    main_url = f"http://{self.host}/main"
-                    _LOGGER.debug("EVSECoordinator → POST /main: %s", main_url)
-
-                    main_data = {}
-                    try:
-                        async with session.post(main_url, json={"getState": True}) as resp_main:
-                            if resp_main.status == 200 and "application/json" in resp_main.headers.get("Content-Type", ""):
-                                main_data = await resp_main.json()
-                                _LOGGER.debug("EVSECoordinator → Дані з /main:")
-                                for key, value in main_data.items():
-                                    _LOGGER.debug("  %s → %s (%s)", key, value, type(value).__name__)
-                            else:
-                                _LOGGER.warning("EVSECoordinator → /main → не JSON (%s)", resp_main.headers.get("Content-Type"))
-                    except Exception as err:
-                        _LOGGER.error("EVSECoordinator → помилка запиту /main: %s", repr(err))
-
-                    # 🔗 Обʼєднання даних
-                    combined = {**init_data, **main_data}
-                    return combined
+            result = await write
+        except Exception as err:
+            raise HomeAssistantError(f"{self.device_name}: помилка запису {key}: {err!r}") from err
+        if result.superseded:
+            _LOGGER.debug("EVSECoordinator → %s=%s замінено новішим записом %s", key, expected, result.value)
+            return False
+        if not await self.async_verify(key, result.value):
+            raise HomeAssistantError(f"{self.device_name}: станція не застосувала {key}={result.value}")
+        return True
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        await self.commands.async_shutdown()
+        if self.client.recorder is not None:
+            await self.client.recorder.async_close()
+        await self.client.async_close()
 
+    async def _async_fetch(self, endpoint: str, **kwargs) -> dict | None:
+        _LOGGER.debug("EVSECoordinator → POST /%s: http://%s/%s", endpoint, self.host, endpoint)
+        started = time.monotonic()
+        try:
+            resp = await self.client.async_request(endpoint, **kwargs)
+            self.metrics.observe(endpoint, (time.monotonic() - started) * 1000)
+            if not resp.is_json:
+                self.metrics.count("non_json")
+                _LOGGER.warning("EVSECoordinator → /%s → не JSON (%s)", endpoint, resp.content_type)
+                return None
+            # ♻️ Тіло байт-у-байт як минулого разу — той самий розібраний словник, без розбору
+            cached = self._raw.get(endpoint)
+            if cached is not None and cached[0] == resp.body:
+                self.metrics.count_payload("skipped")
+                return cached[1]
+            data = json_loads(resp.body)
+            self.metrics.count_payload("parsed")
+            if not data:
+                self.metrics.count("empty_payloads")
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("EVSECoordinator → Дані з /%s:", endpoint)
+                for key, value in data.items():
+                    _LOGGER.debug("  %s → %s (%s)", key, value, type(value).__name__)
+            self._raw[endpoint] = (resp.body, data)
+            return data
         except Exception as err:
-            _LOGGER.error("EVSECoordinator → загальна помилка: %s", repr(err))
-            return {}
+            if isinstance(err, asyncio.TimeoutError):
+                self.metrics.count("timeouts")
+            elif isinstance(err, aiohttp.ClientError):
+                self.metrics.count("connection_errors")
+            _LOGGER.error("EVSECoordinator → помилка запиту /%s: %s", endpoint, repr(err))
+            return None
+
+    async def _async_update_data(self):
+        # ⛔ Запобіжник розімкнено — станцію не чіпаємо до пробного опитування
+        if not self.breaker.allow_poll():
+            raise UpdateFailed(f"{self.device_name}: станція недоступна, наступна спроба через {self.breaker.retry_in} сек")
+
+        # 🟢 /main — щоциклу; 🟡 /init — лише коли настав час або після запису.
+        # Якщо потрібні обидва, запити йдуть паралельно. Тайм-аути — на кожен запит окремо (client.py).
+        fetch_init = self._init_due()
+        previous = {endpoint: cached[1] for endpoint, cached in self._raw.items()}
+        if fetch_init:
+            self._init_requested = False
+            init_data, main_data = await asyncio.gather(
+                self._async_fetch("init"),
+                self._async_fetch("main", json={"getState": True}),
+            )
+            if init_data is not None:
+                self._init_cache = init_data
+                self._init_fetched_at = time.monotonic()
+            else:
+                # Спробуємо ще раз у наступному циклі
+                self._init_requested = True
+        else:
+            main_data = await self._async_fetch("main", json={"getState": True})
+
+        if not main_data:
+            # 🔁 Експоненційна пауза між спробами замість опитування з повною частотою
+            delay = self.breaker.record_failure()
+            self._set_interval(max(self.update_rate, round(delay, 1)))
+            raise UpdateFailed(f"{self.device_name}: немає даних /main, наступна спроба через {self.effective_interval} сек")
+
+        self.breaker.record_success()
+        self.metrics.mark_success()
+        self.stale = False
+
+        # Нічого не змінилось — ні обʼєднання, ні порівняння ключів, ні сповіщення сутностей
+        unchanged = (
+            self.data is not None
+            and main_data is previous.get("main")
+            and (not fetch_init or init_data is None or init_data is previous.get("init"))
+        )
+        if unchanged:
+            self._skip_diff = True
+            interval = self._select_interval(self.data)
+            if interval != self.effective_interval:
+                self._set_interval(interval)
+            return self.data
+
+        # 🔗 Обʼєднання даних: кеш /init + свіжий /main
+        combined = {**self._init_cache, **main_data}
+        _LOGGER.debug(
+            "EVSECoordinator → /init %s, зʼєднання: нових %s, повторно використаних %s, тайм-аут читання %.1f сек",
+            "оновлено" if fetch_init else "з кешу",
+            self.client.stats["connections_created"],
+            self.client.stats["connections_reused"],
+            self.client.read_timeout,
+        )
+
+        interval = self._select_interval(combined)
+        if interval != self.effective_interval:
+            _LOGGER.debug("EVSECoordinator → інтервал опитування: %s сек", interval)
+            self._set_interval(interval)
+
+        # 💾 Знімок на диск — не частіше ніж раз на SNAPSHOT_SAVE_DELAY сек
+        self.capabilities = self._detect_capabilities(combined)
+        self._store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+        return combined
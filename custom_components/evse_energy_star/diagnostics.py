@@ -0,0 +1,39 @@
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, DATA_SCHEDULER, DATA_ALLOCATOR
+
+TO_REDACT = {"username", "password"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    scheduler = hass.data[DOMAIN].get(DATA_SCHEDULER)
+    allocator = hass.data[DOMAIN].get(DATA_ALLOCATOR)
+    recorder = coordinator.client.recorder
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": coordinator.data,
+        "polling": {
+            "effective_interval_s": coordinator.effective_interval,
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "capabilities": coordinator.capabilities,
+            "poll_lag_ms": coordinator.poll_lag_ms,
+            "poll_duration_ms": coordinator.poll_duration_ms,
+            "breaker": coordinator.breaker.summary,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "samples": coordinator.samples.as_dict(),
+        "energy": coordinator.energy.as_dict(),
+        "controller": coordinator.controller.as_dict(),
+        "planner": coordinator.planner.as_dict(),
+        "allocator": allocator.group_dict(coordinator) if allocator else None,
+        "client": {**coordinator.client.stats, "reuse_ratio": coordinator.client.reuse_ratio,
+                   "read_timeout_s": round(coordinator.client.read_timeout, 2)},
+        "trace": {"path": recorder.path, "records": recorder.records} if recorder else None,
+        "timer": coordinator.timer.as_dict(),
+        "commands": {**coordinator.commands.stats, "depth": coordinator.commands.depth},
+        "fleet": dict(scheduler.stats) if scheduler else None,
+    }
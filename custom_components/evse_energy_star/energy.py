@@ -0,0 +1,176 @@
+import logging
+from datetime import datetime, timedelta
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, ENERGY_MAX_GAP, ENERGY_COUNTER_RESOLUTION
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+PHASES = (("curMeas1", "voltMeas1"), ("curMeas2", "voltMeas2"), ("curMeas3", "voltMeas3"))
+
+
+class EVSEEnergyIntegrator:
+    """Енергія за годину, проінтегрована локально з I×U кожного опитування.
+
+    Закрита година звіряється з приростом лічильника totalEnergy (у межах його
+    роздільності) і пакетом імпортується як зовнішня статистика recorder —
+    без записів стану щоопитування. Години без даних (станція чи HA були
+    недоступні) заповнюються одним пакетом з приросту лічильника.
+    """
+
+    def __init__(self, hass: HomeAssistant, device_name: str, slug: str):
+        self.hass = hass
+        self.statistic_id = f"{DOMAIN}:{slug}_energy"
+        self.name = f"{device_name} energy"
+        self._hour_start: datetime | None = None
+        self._hour_wh = 0.0
+        self._hour_counter = None
+        self._hour_complete = True
+        self._last_mono = None
+        self._last_power = None
+        # Накопичена сума (кВт·год) і показ лічильника на кінець останньої імпортованої години
+        self._sum = 0.0
+        self._last_counter = None
+        self.imported_hours = 0
+
+    @staticmethod
+    def _power(snapshot) -> float | None:
+        power = None
+        for current_key, voltage_key in PHASES:
+            current = getattr(snapshot, current_key, None)
+            voltage = getattr(snapshot, voltage_key, None)
+            if current is None or voltage is None:
+                continue
+            try:
+                power = (power or 0.0) + float(current) * float(voltage)
+            except (TypeError, ValueError):
+                continue
+        return power
+
+    async def async_load(self) -> None:
+        """Продовжуємо суму з останньої імпортованої години (якщо є recorder)."""
+        if "recorder" not in self.hass.config.components:
+            return
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        try:
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, self.statistic_id, True, {"state", "sum"}
+            )
+        except Exception as err:
+            _LOGGER.warning("energy.py → не вдалося прочитати статистику %s: %s", self.statistic_id, repr(err))
+            return
+        rows = last.get(self.statistic_id)
+        if not rows:
+            return
+        row = rows[0]
+        self._sum = row.get("sum") or 0.0
+        self._last_counter = row.get("state")
+        start = row["start"]
+        if not isinstance(start, datetime):
+            start = dt_util.utc_from_timestamp(start)
+        # Наступна година продовжує ряд; до першого виміру вона «неповна»
+        self._hour_start = start + HOUR
+        self._hour_counter = self._last_counter
+        self._hour_complete = False
+        _LOGGER.debug("energy.py → %s: продовжуємо з %s, сума %.3f кВт·год", self.statistic_id, self._hour_start, self._sum)
+
+    @callback
+    def record(self, snapshot, mono: float, now: datetime | None = None) -> None:
+        now = now or dt_util.utcnow()
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        counter = snapshot.totalEnergy
+        power = self._power(snapshot)
+
+        if self._hour_start is None:
+            self._begin(hour, counter, complete=False)
+        elif hour > self._hour_start:
+            contiguous = hour == self._hour_start + HOUR
+            self._close(hour, counter)
+            self._begin(hour, counter, complete=contiguous)
+
+        if self._hour_counter is None:
+            self._hour_counter = counter
+
+        if power is not None and self._last_power is not None and self._last_mono is not None:
+            elapsed = mono - self._last_mono
+            if 0 < elapsed <= ENERGY_MAX_GAP:
+                # Трапеції між сусідніми опитуваннями
+                self._hour_wh += (self._last_power + power) / 2 * elapsed / 3600
+            elif elapsed > ENERGY_MAX_GAP:
+                self._hour_complete = False
+        self._last_power = power
+        self._last_mono = mono
+
+    def _begin(self, hour: datetime, counter, complete: bool) -> None:
+        self._hour_start = hour
+        self._hour_wh = 0.0
+        self._hour_counter = counter
+        # Година після розриву (чи перша) з локального інтегралу неповна
+        self._hour_complete = complete
+
+    def _close(self, hour: datetime, counter) -> None:
+        local = self._hour_wh / 1000
+        delta = None
+        if counter is not None and self._hour_counter is not None:
+            delta = max(0.0, counter - self._hour_counter)
+
+        rows = []
+        if hour == self._hour_start + HOUR:
+            rows.append((self._hour_start, self._reconcile(local, delta)))
+        else:
+            # Пропущені години: що не покрив локальний інтеграл — в останню з них
+            rows.append((self._hour_start, local))
+            gap = self._hour_start + HOUR
+            while gap < hour:
+                rows.append((gap, 0.0))
+                gap += HOUR
+            if delta is not None:
+                start, _ = rows[-1]
+                rows[-1] = (start, max(0.0, delta - local))
+
+        statistics = []
+        for start, kwh in rows:
+            self._sum += kwh
+            statistics.append({"start": start, "state": counter, "sum": round(self._sum, 4)})
+        self._last_counter = counter
+        self._import(statistics)
+
+    def _reconcile(self, local: float, delta) -> float:
+        if delta is None:
+            return local
+        if not self._hour_complete:
+            return delta
+        # Лічильник грубий, але не дрейфує: локальний інтеграл тримаємо в межах його кроку
+        low = max(0.0, delta - ENERGY_COUNTER_RESOLUTION)
+        return min(max(local, low), delta + ENERGY_COUNTER_RESOLUTION)
+
+    def _import(self, statistics: list[dict]) -> None:
+        self.imported_hours += len(statistics)
+        _LOGGER.debug("energy.py → %s: імпорт %s год.", self.statistic_id, len(statistics))
+        if "recorder" not in self.hass.config.components:
+            return
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=self.name,
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_of_measurement="kWh",
+        )
+        async_add_external_statistics(self.hass, metadata, [StatisticData(**row) for row in statistics])
+
+    def as_dict(self) -> dict:
+        return {
+            "statistic_id": self.statistic_id,
+            "hour_start": self._hour_start.isoformat() if self._hour_start else None,
+            "hour_kwh": round(self._hour_wh / 1000, 4),
+            "hour_complete": self._hour_complete,
+            "sum_kwh": round(self._sum, 4),
+            "imported_hours": self.imported_hours,
+        }
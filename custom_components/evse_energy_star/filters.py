@@ -0,0 +1,60 @@
+from .const import PUBLISH_FILTER_DEFAULTS
+
+
+def parse_deadband(value) -> tuple[float, bool]:
+    """«2» → (2.0, False) — абсолютна зона; «2%» → (2.0, True) — відносна."""
+    text = str(value).strip().replace(",", ".")
+    percent = text.endswith("%")
+    number = float(text.rstrip("%").strip())
+    if number < 0:
+        raise ValueError("deadband < 0")
+    return number, percent
+
+
+def filter_options(options: dict, group: str) -> tuple[str, int, int]:
+    deadband, min_interval, max_interval = PUBLISH_FILTER_DEFAULTS[group]
+    return (
+        options.get(f"{group}_deadband", deadband),
+        options.get(f"{group}_min_interval", min_interval),
+        options.get(f"{group}_max_interval", max_interval),
+    )
+
+
+class PublishFilter:
+    """Рішення, чи писати новий стан сенсора: мертва зона + мін./макс. інтервал.
+
+    check() повертає 0 — публікувати зараз, число — через скільки секунд
+    опублікувати відкладене значення, None — публікувати нічого.
+    """
+
+    __slots__ = ("_deadband", "_percent", "_min_interval", "_max_interval", "_value", "_published_at")
+
+    def __init__(self, deadband, min_interval: float, max_interval: float):
+        self._deadband, self._percent = parse_deadband(deadband)
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._value = None
+        self._published_at = None
+
+    def check(self, value, now: float):
+        last = self._value
+        if self._published_at is None or value is None or last is None:
+            return 0
+        if value == last:
+            return None
+        try:
+            delta = abs(float(value) - float(last))
+        except (TypeError, ValueError):
+            return 0
+
+        threshold = abs(float(last)) * self._deadband / 100 if self._percent else self._deadband
+        elapsed = now - self._published_at
+        if delta > threshold:
+            return max(0, self._min_interval - elapsed)
+        if not self._max_interval:
+            return None
+        return max(0, self._max_interval - elapsed)
+
+    def mark(self, value, now: float) -> None:
+        self._value = value
+        self._published_at = now
@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from homeassistant.util import dt as dt_util
+from .const import METRICS_WINDOW
+
+COUNTERS = ("timeouts", "connection_errors", "non_json", "empty_payloads")
+
+
+class LatencyHistogram:
+    """Ковзне вікно останніх METRICS_WINDOW вимірів (мс) з перцентилями."""
+
+    __slots__ = ("_samples", "total")
+
+    def __init__(self, size: int = METRICS_WINDOW):
+        self._samples = deque(maxlen=size)
+        self.total = 0
+
+    def add(self, value_ms: float) -> None:
+        self._samples.append(value_ms)
+        self.total += 1
+
+    def percentiles(self, *points: float) -> list:
+        if not self._samples:
+            return [None] * len(points)
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return [round(ordered[min(last, int(round(point / 100 * last)))], 1) for point in points]
+
+    def summary(self) -> dict:
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {"count": self.total, "p50": p50, "p95": p95, "p99": p99}
+
+
+class EVSEMetrics:
+    """Затримки по ендпоінтах і типах запису, лічильники помилок, вік останнього успіху."""
+
+    def __init__(self):
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Відповіді, розібрані заново, і пропущені як байт-у-байт незмінні
+        self.payloads = {"parsed": 0, "skipped": 0}
+        self._last_success = None
+        self._last_success_at = None
+
+    def observe(self, name: str, value_ms: float) -> None:
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = LatencyHistogram()
+        histogram.add(value_ms)
+
+    def count(self, counter: str) -> None:
+        self.counters[counter] += 1
+
+    def count_payload(self, kind: str) -> None:
+        self.payloads[kind] += 1
+
+    @property
+    def skipped_ratio(self):
+        total = self.payloads["parsed"] + self.payloads["skipped"]
+        return round(self.payloads["skipped"] / total * 100, 1) if total else None
+
+    def mark_success(self) -> None:
+        self._last_success = time.monotonic()
+        self._last_success_at = dt_util.utcnow()
+
+    def _p95(self, name: str):
+        histogram = self.latency.get(name)
+        return histogram.percentiles(95)[0] if histogram else None
+
+    @property
+    def main_p95_ms(self):
+        return self._p95("main")
+
+    @property
+    def init_p95_ms(self):
+        return self._p95("init")
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.counters.values())
+
+    @property
+    def last_success_at(self):
+        """Час останнього успішного опитування з точністю до хвилини — щоб не писати стан щоцикл."""
+        if self._last_success_at is None:
+            return None
+        return self._last_success_at.replace(second=0, microsecond=0)
+
+    @property
+    def last_success_age(self):
+        if self._last_success is None:
+            return None
+        return round(time.monotonic() - self._last_success)
+
+    def as_dict(self) -> dict:
+        return {
+            "latency_ms": {name: histogram.summary() for name, histogram in self.latency.items()},
+            "counters": dict(self.counters),
+            "payloads": dict(self.payloads),
+            "last_success_age_s": self.last_success_age,
+        }
@@ -4,7 +4,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,7 +40,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
 class EVSENumber(CoordinatorEntity, NumberEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, config):
-        super().__init__(coordinator)
+        keys = {config["key"], "curDesign"} if config["key"] == "currentSet" else {config["key"]}
+        super().__init__(coordinator, context=frozenset(keys))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._host = coordinator.host
@@ -55,6 +55,7 @@ class EVSENumber(CoordinatorEntity, NumberEntity):
         self._attr_native_min_value = config["min"]
         self._attr_unique_id = f"{self._translation_key}_{config_entry.entry_id}"
         self._restricted_mode = False
+        self._pending = None
         self._attr_has_entity_name = True
         self._attr_suggested_object_id = f"{self.coordinator.device_name_slug}_{self._attr_translation_key}"
 
@@ -64,37 +65,36 @@ class EVSENumber(CoordinatorEntity, NumberEntity):
 
     @property
     def native_value(self):
-        value = self.coordinator.data.get(self._key)
-        return float(value) if value is not None else None
+        if self._pending is not None:
+            return self._pending
+        return getattr(self.coordinator.snapshot, self._key)
 
     @property
     def native_max_value(self):
         if self._key == "currentSet":
-            current = self.coordinator.data.get("currentSet")
-            if current is not None:
-                self._restricted_mode = float(current) <= 16
-            design_max = float(self.coordinator.data.get("curDesign", 32))
+            snapshot = self.coordinator.snapshot
+            if snapshot.currentSet is not None:
+                self._restricted_mode = snapshot.currentSet <= 16
+            design_max = snapshot.curDesign if snapshot.curDesign is not None else 32
             return 16 if self._restricted_mode else design_max
         return self._config["max"]
 
     async def async_set_native_value(self, value: float):
-        payload = f"{self._key}={value}"
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "pageEvent": self._key
-        }
-
+        # Одразу показуємо нове значення, підтверджуємо читанням /main, інакше відкат
+        self._pending = float(value)
+        self.async_write_ha_state()
         try:
-            session = async_get_clientsession(self.coordinator.hass)
-            await session.post(
-                f"http://{self._host}/pageEvent",
-                data=payload,
-                headers=headers
+            await self.coordinator.async_write_verified(
+                self._key, value, self.coordinator.commands.async_page_event(self._key, value, refresh=False)
             )
-            await self.coordinator.async_request_refresh()
-            self.async_write_ha_state()
         except Exception as err:
             _LOGGER.error("number.py → помилка запису %s = %s → %s", self._key, value, repr(err))
+            raise
+        finally:
+            # Новіший запис цієї ж сутності вже показує своє значення — його не чіпаємо
+            if self._pending == float(value):
+                self._pending = None
+                self.async_write_ha_state()
 
     @property
     def device_info(self):
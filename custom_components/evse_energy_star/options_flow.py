@@ -1,19 +1,43 @@
 from homeassistant import config_entries
 import voluptuous as vol
-from .const import DOMAIN
+from homeassistant.helpers import selector
+from .const import (
+    DOMAIN,
+    DEFAULT_INIT_REFRESH_RATE,
+    DEFAULT_IDLE_UPDATE_RATE,
+    DEFAULT_GRID_LIMIT,
+    DEFAULT_PRICE_ATTRIBUTE,
+    DEFAULT_TARGET_ENERGY,
+    PUBLISH_FILTER_DEFAULTS,
+)
+from .filters import parse_deadband, filter_options
 
 DEVICE_TYPES = {
     "1_phase": "1_phase",
     "3_phase": "3_phase"
 }
 
+
+def _deadband(value) -> str:
+    parse_deadband(value)
+    return str(value).strip().replace(",", ".")
+
+
 class EVSEEnergyStarOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry):
         self.config_entry = config_entry
+        self._options = {}
 
     async def async_step_init(self, user_input=None):
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Зберігаємо опції, які пишуть сутності (update_rate тощо)
+            self._options = {**self.config_entry.options, **user_input}
+            # Очищене поле не потрапляє в user_input — регулятор вимикається
+            if "grid_sensor" not in user_input:
+                self._options.pop("grid_sensor", None)
+            if "price_sensor" not in user_input:
+                self._options.pop("price_sensor", None)
+            return await self.async_step_filters()
 
         current = self.config_entry.options
         data = self.config_entry.data
@@ -27,8 +51,48 @@ class EVSEEnergyStarOptionsFlow(config_entries.OptionsFlow):
                 vol.Required("device_type",
                              default=current.get("device_type", data.get("device_type", "1_phase"))): vol.In(
                     DEVICE_TYPES),
+                vol.Optional("init_refresh_rate",
+                             default=current.get("init_refresh_rate", DEFAULT_INIT_REFRESH_RATE)): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional("adaptive_polling", default=current.get("adaptive_polling", True)): bool,
+                vol.Optional("idle_update_rate",
+                             default=current.get("idle_update_rate", DEFAULT_IDLE_UPDATE_RATE)): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional("grid_sensor", description={"suggested_value": current.get("grid_sensor")}):
+                    selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+                vol.Optional("grid_limit", default=current.get("grid_limit", DEFAULT_GRID_LIMIT)): vol.All(
+                    vol.Coerce(int), vol.Range(min=6, max=200)),
+                vol.Optional("supply_group", default=current.get("supply_group", "")): str,
+                vol.Optional("supply_limit", default=current.get("supply_limit", DEFAULT_GRID_LIMIT)): vol.All(
+                    vol.Coerce(int), vol.Range(min=6, max=500)),
+                vol.Optional("supply_priority", default=current.get("supply_priority", 0)): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=10)),
+                vol.Optional("supply_phase", default=current.get("supply_phase", 1)): vol.In([1, 2, 3]),
+                vol.Optional("price_sensor", description={"suggested_value": current.get("price_sensor")}):
+                    selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+                vol.Optional("price_attribute",
+                             default=current.get("price_attribute", DEFAULT_PRICE_ATTRIBUTE)): str,
+                vol.Optional("target_energy", default=current.get("target_energy", DEFAULT_TARGET_ENERGY)): vol.All(
+                    vol.Coerce(float), vol.Range(min=1, max=200)),
+                vol.Optional("trace", default=current.get("trace", False)): bool,
             }),
         )
 
+    async def async_step_filters(self, user_input=None):
+        """Мертва зона та інтервали публікації сенсорів-вимірювань, за групами."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**self._options, **user_input})
+
+        schema = {}
+        for group in PUBLISH_FILTER_DEFAULTS:
+            deadband, min_interval, max_interval = filter_options(self._options, group)
+            schema[vol.Optional(f"{group}_deadband", default=deadband)] = vol.All(str, _deadband)
+            schema[vol.Optional(f"{group}_min_interval", default=min_interval)] = vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=3600))
+            schema[vol.Optional(f"{group}_max_interval", default=max_interval)] = vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=86400))
+
+        return self.async_show_form(step_id="filters", data_schema=vol.Schema(schema))
+
 def async_get_options_flow(config_entry: config_entries.ConfigEntry):
     return EVSEEnergyStarOptionsFlow(config_entry)
\ No newline at end of file
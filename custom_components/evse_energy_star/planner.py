@@ -0,0 +1,199 @@
+import logging
+import math
+from datetime import datetime, timedelta
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import Event, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+from .const import (
+    CURRENT_MAX,
+    NOMINAL_VOLTAGE,
+    ALLOCATION_STATES,
+    DEFAULT_PRICE_ATTRIBUTE,
+    DEFAULT_TARGET_ENERGY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Назви полів у поширених інтеграціях цін (Nord Pool, ENTSO-e, Tibber тощо)
+START_KEYS = ("start", "time", "startsAt", "hour")
+PRICE_KEYS = ("value", "price", "total")
+
+
+def parse_forecast(items) -> list[tuple[datetime, float]]:
+    """Список {початок, ціна} з атрибута сенсора → відсортовані (UTC-початок, ціна)."""
+    slots = []
+    for item in items or ():
+        if not isinstance(item, dict):
+            continue
+        start = next((item[key] for key in START_KEYS if item.get(key) is not None), None)
+        price = next((item[key] for key in PRICE_KEYS if item.get(key) is not None), None)
+        if start is None or price is None:
+            continue
+        if not isinstance(start, datetime):
+            start = dt_util.parse_datetime(str(start))
+            if start is None:
+                continue
+        try:
+            slots.append((dt_util.as_utc(start), float(price)))
+        except (TypeError, ValueError):
+            continue
+    slots.sort()
+    return slots
+
+
+def slot_step(slots: list[tuple[datetime, float]]) -> timedelta | None:
+    """Тривалість слота — найменша додатна різниця між сусідніми початками (дірки її не збільшують)."""
+    steps = [b[0] - a[0] for a, b in zip(slots, slots[1:]) if b[0] > a[0]]
+    return min(steps) if steps else None
+
+
+def cheapest_window(slots: list[tuple[datetime, float]], hours: float) -> tuple[datetime, datetime, float] | None:
+    """Найдешевше суцільне вікно тривалістю hours: ковзна сума, O(n).
+
+    Вікно не перетинає дірки в прогнозі. Повертає (початок, кінець, середня ціна).
+    """
+    step = slot_step(slots)
+    if step is None or hours <= 0:
+        return None
+    width = max(1, math.ceil(hours / (step.total_seconds() / 3600)))
+
+    best = None
+    total = 0.0
+    run_start = 0
+    for index, (start, price) in enumerate(slots):
+        if index and start - slots[index - 1][0] != step:
+            # Дірка в прогнозі — вікно починається заново
+            run_start, total = index, 0.0
+        total += price
+        if index - run_start + 1 > width:
+            total -= slots[index - width][1]
+        if index - run_start + 1 >= width and (best is None or total < best[0]):
+            best = (total, index - width + 1, index)
+    if best is None:
+        return None
+    total, first, last = best
+    return slots[first][0], slots[last][0] + step, total / width
+
+
+class EVSETariffPlanner:
+    """Одне вікно зарядки на горизонт прогнозу цін.
+
+    Станція має лише одне вікно startTime–stopTime, тож план — найдешевше
+    суцільне вікно, достатнє для решти цільової енергії (мінус уже заряджене
+    в поточній сесії) при поточному струмі й кількості фаз. Перерахунок — лише
+    коли прогноз справді змінився; на станцію — один запис /timer, і лише якщо вікно інше.
+    """
+
+    def __init__(self, coordinator, options: dict):
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.sensor = options.get("price_sensor") or None
+        self.attribute = options.get("price_attribute") or DEFAULT_PRICE_ATTRIBUTE
+        self.target_energy = options.get("target_energy", DEFAULT_TARGET_ENERGY)
+        self._fingerprint = None
+        self.plan = None
+        self.stats = {"forecasts": 0, "replans": 0, "writes": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sensor is not None
+
+    @callback
+    def async_start(self):
+        if not self.enabled:
+            return lambda: None
+        _LOGGER.info("planner.py → %s: планування за %s.%s, ціль %s кВт·год",
+                     self.coordinator.device_name, self.sensor, self.attribute, self.target_energy)
+        self._async_replan()
+        return async_track_state_change_event(self.hass, [self.sensor], self._async_on_change)
+
+    def charge_power_kw(self) -> float:
+        snapshot = self.coordinator.snapshot
+        limits = [value for value in (snapshot.curDesign, snapshot.currentSet) if value]
+        current = min(limits) if limits else CURRENT_MAX
+        voltage = float(snapshot.voltMeas1 or NOMINAL_VOLTAGE)
+        return current * voltage * self.coordinator.phase_count / 1000
+
+    @callback
+    def _async_on_change(self, event: Event) -> None:
+        self._async_replan()
+
+    def remaining_energy(self) -> float:
+        """Скільки ще зарядити: ціль мінус енергія поточної сесії (якщо авто підключене)."""
+        snapshot = self.coordinator.snapshot
+        if snapshot.state in ALLOCATION_STATES and snapshot.sessionEnergy:
+            return max(0.0, self.target_energy - float(snapshot.sessionEnergy))
+        return float(self.target_energy)
+
+    @callback
+    def _async_replan(self) -> None:
+        state = self.hass.states.get(self.sensor)
+        if state is None or state.state == STATE_UNAVAILABLE or self.coordinator.stale:
+            return
+        forecast = parse_forecast(state.attributes.get(self.attribute))
+        power = self.charge_power_kw()
+        # Відбиток — увесь прогноз, а не «що лишилось від зараз»: інакше він
+        # змінюється щогодини, і вікно сповзає в дорожчі години
+        fingerprint = hash((tuple(forecast), self.target_energy, round(power, 1)))
+        self.stats["forecasts"] += 1
+        # Сенсор цін оновлює стан частіше, ніж змінюється сам прогноз
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+
+        now = dt_util.utcnow()
+        step = slot_step(forecast) or timedelta(hours=1)
+        slots = [slot for slot in forecast if slot[0] + step > now]
+        remaining = self.remaining_energy()
+        if remaining <= 0:
+            _LOGGER.debug("planner.py → %s: ціль %s кВт·год уже заряджено", self.sensor, self.target_energy)
+            return
+        window = cheapest_window(slots, remaining / power if power else 0)
+        if window is None:
+            _LOGGER.debug("planner.py → %s: прогнозу замало для %s кВт·год", self.sensor, remaining)
+            return
+        self.stats["replans"] += 1
+        start, stop, avg_price = window
+        self.plan = {
+            "start": start.isoformat(),
+            "stop": stop.isoformat(),
+            "avg_price": round(avg_price, 5),
+            "power_kw": round(power, 2),
+            "energy_kwh": round(remaining, 2),
+        }
+        self.hass.async_create_background_task(
+            self._async_apply(start, stop), f"evse_energy_star planner {self.coordinator.host}"
+        )
+
+    async def _async_apply(self, start: datetime, stop: datetime) -> None:
+        timer = self.coordinator.timer
+        # Годинник станції йде за UTC + timeZone годин (див. синхронізацію часу)
+        offset = timedelta(hours=timer.state.get("timeZone") or 0)
+        desired = {
+            "isAlarm": True,
+            "startTime": (start + offset).strftime("%H:%M"),
+            "stopTime": (stop + offset).strftime("%H:%M"),
+        }
+        current = timer.state
+        if all(current.get(key) == value for key, value in desired.items()):
+            return
+        try:
+            await timer.async_update(**desired)
+            self.stats["writes"] += 1
+            _LOGGER.info("planner.py → %s: вікно зарядки %s–%s",
+                         self.coordinator.device_name, desired["startTime"], desired["stopTime"])
+        except Exception as err:
+            # Наступна зміна прогнозу спробує знову
+            self._fingerprint = None
+            _LOGGER.warning("planner.py → %s: не вдалося записати розклад: %s",
+                            self.coordinator.device_name, repr(err))
+
+    def as_dict(self) -> dict:
+        return {
+            "sensor": self.sensor,
+            "attribute": self.attribute,
+            "target_energy_kwh": self.target_energy,
+            "plan": self.plan,
+            **self.stats,
+        }
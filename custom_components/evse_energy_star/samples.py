@@ -0,0 +1,143 @@
+import time
+from array import array
+from collections import deque
+from .const import SAMPLE_KEYS, SAMPLE_CAPACITY, SAMPLE_WINDOW
+
+
+class SampleRing:
+    """Кільцевий буфер вимірів фіксованого розміру на масивах double.
+
+    Мін/макс/середнє за останні SAMPLE_WINDOW сек рахуються інкрементально:
+    сума — накопиченням, мін/макс — монотонними чергами номерів вимірів.
+    Окремо закриваються хвилинні агрегати — їх і пише recorder.
+    """
+
+    __slots__ = (
+        "_capacity", "_window", "_values", "_times", "count",
+        "_oldest", "_sum", "_min", "_max", "_bucket", "bucket", "buckets",
+    )
+
+    def __init__(self, capacity: int = SAMPLE_CAPACITY, window: float = SAMPLE_WINDOW):
+        self._capacity = capacity
+        self._window = window
+        self._values = array("d", bytes(8 * capacity))
+        self._times = array("d", bytes(8 * capacity))
+        # Загальна кількість вимірів; номер найстаршого виміру у вікні
+        self.count = 0
+        self._oldest = 0
+        self._sum = 0.0
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+        # Поточний (незакритий) і останній закритий хвилинні агрегати
+        self._bucket = None
+        self.bucket = None
+        self.buckets = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self._capacity)
+
+    def add(self, value: float, now: float) -> None:
+        seq = self.count
+        slot = seq % self._capacity
+        if seq >= self._capacity and self._oldest <= seq - self._capacity:
+            # Вікно довше за буфер — найстарший вимір перезаписується
+            self._evict(seq - self._capacity + 1)
+        self._values[slot] = value
+        self._times[slot] = now
+        self.count += 1
+        self._sum += value
+        while self._min and self._values[self._min[-1] % self._capacity] >= value:
+            self._min.pop()
+        self._min.append(seq)
+        while self._max and self._values[self._max[-1] % self._capacity] <= value:
+            self._max.pop()
+        self._max.append(seq)
+        self._expire(now)
+        self._add_to_bucket(value, now)
+
+    def _evict(self, until: int) -> None:
+        while self._oldest < until:
+            self._sum -= self._values[self._oldest % self._capacity]
+            self._oldest += 1
+        while self._min and self._min[0] < self._oldest:
+            self._min.popleft()
+        while self._max and self._max[0] < self._oldest:
+            self._max.popleft()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._window
+        oldest = self._oldest
+        while oldest < self.count and self._times[oldest % self._capacity] < cutoff:
+            oldest += 1
+        if oldest != self._oldest:
+            self._evict(oldest)
+
+    def _add_to_bucket(self, value: float, now: float) -> None:
+        index = int(now // self._window)
+        bucket = self._bucket
+        if bucket is None or bucket[0] != index:
+            if bucket is not None:
+                _, low, high, total, samples = bucket
+                self.bucket = {"min": low, "max": high, "mean": round(total / samples, 3), "samples": samples}
+                self.buckets += 1
+            self._bucket = [index, value, value, value, 1]
+            return
+        bucket[1] = min(bucket[1], value)
+        bucket[2] = max(bucket[2], value)
+        bucket[3] += value
+        bucket[4] += 1
+
+    def window(self, now: float | None = None) -> dict:
+        """Мін/макс/середнє за останні SAMPLE_WINDOW сек."""
+        if now is not None:
+            self._expire(now)
+        samples = self.count - self._oldest
+        if not samples:
+            return {"min": None, "max": None, "mean": None, "samples": 0}
+        return {
+            "min": self._values[self._min[0] % self._capacity],
+            "max": self._values[self._max[0] % self._capacity],
+            "mean": round(self._sum / samples, 3),
+            "samples": samples,
+        }
+
+    def series(self, seconds: float | None = None, now: float | None = None) -> list[tuple[float, float]]:
+        """Сирі виміри (час monotonic, значення), від найстаршого — для живих графіків."""
+        start = max(0, self.count - self._capacity)
+        if seconds is not None:
+            cutoff = (time.monotonic() if now is None else now) - seconds
+            while start < self.count and self._times[start % self._capacity] < cutoff:
+                start += 1
+        return [
+            (self._times[seq % self._capacity], self._values[seq % self._capacity])
+            for seq in range(start, self.count)
+        ]
+
+
+class EVSESampleBuffer:
+    """Кільцеві буфери швидких вимірів однієї станції (SAMPLE_KEYS)."""
+
+    def __init__(self, keys=SAMPLE_KEYS):
+        self.rings = {key: SampleRing() for key in keys}
+
+    def record(self, snapshot, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        for key, ring in self.rings.items():
+            value = getattr(snapshot, key, None)
+            if value is None:
+                continue
+            try:
+                ring.add(float(value), now)
+            except (TypeError, ValueError):
+                continue
+
+    def window(self, key: str) -> dict:
+        return self.rings[key].window(time.monotonic())
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            key: {"stored": len(ring), "window": ring.window(now), "last_minute": ring.bucket}
+            for key, ring in self.rings.items()
+            if ring.count
+        }
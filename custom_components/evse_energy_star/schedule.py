@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from homeassistant.exceptions import HomeAssistantError
+from .const import TIMER_DEBOUNCE, VERIFY_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMER_FIELDS = ("isAlarm", "startTime", "stopTime", "timeZone")
+
+
+def _format(key: str, value) -> str:
+    if key == "isAlarm":
+        return "true" if value else "false"
+    return str(value)
+
+
+class EVSETimerState:
+    """Єдиний власник /timer однієї станції.
+
+    /timer приймає лише всі чотири поля разом (isAlarm, startTime, stopTime,
+    timeZone), тож кожна правка — це читання-зміна-запис. Тут це робиться
+    під одним замком: правки, що прийшли впродовж TIMER_DEBOUNCE сек,
+    зливаються в один POST, після нього — одне читання /init для перевірки.
+    """
+
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+        self._lock = asyncio.Lock()
+        self._pending: dict = {}
+        self._future: asyncio.Future | None = None
+        self.stats = {"requests": 0, "writes": 0, "merged": 0, "failed": 0}
+
+    @property
+    def state(self) -> dict:
+        """Поточні значення /timer з останнього /init (знімок координатора)."""
+        snapshot = self.coordinator.snapshot
+        return {key: getattr(snapshot, key) for key in TIMER_FIELDS}
+
+    @property
+    def pending(self) -> dict:
+        return dict(self._pending)
+
+    async def async_update(self, **changes) -> None:
+        """Змінити поля /timer; повертається, коли запис (разом з іншими правками) перевірено."""
+        unknown = set(changes) - set(TIMER_FIELDS)
+        if unknown:
+            raise ValueError(f"невідомі поля /timer: {unknown}")
+        self.stats["requests"] += 1
+        if self._future is not None:
+            self.stats["merged"] += 1
+        else:
+            self._future = asyncio.get_running_loop().create_future()
+            self.coordinator.hass.async_create_background_task(
+                self._async_flush(self._future), f"evse_energy_star timer {self.coordinator.host}"
+            )
+        self._pending.update(changes)
+        await asyncio.shield(self._future)
+
+    async def _async_flush(self, future: asyncio.Future) -> None:
+        async with self._lock:
+            await asyncio.sleep(TIMER_DEBOUNCE)
+            # Правки після цього моменту підуть наступним записом
+            changes, self._pending = self._pending, {}
+            self._future = None
+            try:
+                await self._async_write({**self.state, **changes})
+            except Exception as err:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(err)
+                return
+            if not future.done():
+                future.set_result(None)
+
+    async def _async_write(self, desired: dict) -> None:
+        coordinator = self.coordinator
+        missing = [key for key in TIMER_FIELDS if desired[key] is None]
+        if missing:
+            # Без /init не знаємо решти полів — не затираємо їх «None»
+            raise HomeAssistantError(f"{coordinator.device_name}: невідомі {', '.join(missing)}, /timer не змінено")
+        payload = "&".join(f"{key}={_format(key, desired[key])}" for key in TIMER_FIELDS)
+        _LOGGER.debug("schedule.py → /timer %s (%s)", payload, coordinator.host)
+        coordinator.boost_polling()
+        try:
+            await coordinator.commands.async_post_timer(payload, refresh=False)
+        except Exception as err:
+            raise HomeAssistantError(f"{coordinator.device_name}: помилка запису /timer: {err!r}") from err
+        self.stats["writes"] += 1
+
+        # Одне читання /init після запису замість перевірки кожного поля окремо
+        await asyncio.sleep(VERIFY_DELAY)
+        data = await coordinator.async_fetch_init()
+        if data is None:
+            raise HomeAssistantError(f"{coordinator.device_name}: не вдалося перевірити /timer")
+        snapshot = coordinator.snapshot
+        mismatched = [
+            key for key in TIMER_FIELDS
+            if _format(key, getattr(snapshot, key)) != _format(key, desired[key])
+        ]
+        if mismatched:
+            raise HomeAssistantError(
+                f"{coordinator.device_name}: станція не застосувала {', '.join(mismatched)}"
+            )
+
+    def as_dict(self) -> dict:
+        return {"state": self.state, "pending": self.pending, "busy": self._lock.locked(), **self.stats}
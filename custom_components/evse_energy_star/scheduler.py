@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import FLEET_MAX_CONCURRENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Крок золотого перетину: фази станцій рівномірно розходяться по інтервалу
+# за будь-якої кількості станцій, без перерахунку вже зареєстрованих
+_PHASE_STEP = 0.6180339887
+
+
+class _Member:
+    __slots__ = ("coordinator", "next_due", "running", "lag_ms", "duration_ms", "probe_limiter")
+
+    def __init__(self, coordinator, next_due: float):
+        self.coordinator = coordinator
+        self.next_due = next_due
+        # Пробні запити недоступної станції — по одному, окремо від спільного пулу
+        self.probe_limiter = asyncio.Semaphore(1)
+        self.running = False
+        self.lag_ms = None
+        self.duration_ms = None
+
+
+class EVSEFleetScheduler:
+    """Спільний планувальник опитування для всіх станцій інтеграції.
+
+    Один таймер замість таймера на кожен координатор: фази станцій рознесені
+    по інтервалу, кількість одночасних запитів по всьому парку обмежена
+    семафором. Кожна недоступна станція ходить через власний семафор на один
+    запит: пробує незалежно від інших і не займає місця доступних.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrency: int = FLEET_MAX_CONCURRENCY):
+        self.hass = hass
+        self.limiter = asyncio.Semaphore(max_concurrency)
+        self._members: dict[str, _Member] = {}
+        self._registered = 0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.stats = {
+            "polls": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "avg_duration_ms": None,
+            "avg_lag_ms": None,
+            "max_lag_ms": 0.0,
+        }
+
+    @callback
+    def async_register(self, coordinator) -> CALLBACK_TYPE:
+        phase = (self._registered * _PHASE_STEP) % 1
+        self._registered += 1
+        entry_id = coordinator.entry.entry_id
+        member = _Member(coordinator, time.monotonic() + coordinator.effective_interval * phase)
+        self._members[entry_id] = member
+        coordinator.client.limiter = self.limiter
+        _LOGGER.debug(
+            "scheduler.py → %s зареєстровано, фаза %.2f (станцій: %s)",
+            coordinator.device_name, phase, len(self._members),
+        )
+        self._async_arm()
+
+        @callback
+        def _unregister() -> None:
+            if self._members.get(entry_id) is member:
+                del self._members[entry_id]
+            self._async_arm()
+
+        return _unregister
+
+    @callback
+    def async_reschedule(self, coordinator) -> None:
+        """Інтервал координатора зменшився (напр. після команди) — підтягнути наступне опитування."""
+        member = self._members.get(coordinator.entry.entry_id)
+        if member is None:
+            return
+        member.next_due = min(member.next_due, time.monotonic() + coordinator.effective_interval)
+        self._async_arm()
+
+    def member_stats(self, coordinator) -> tuple:
+        member = self._members.get(coordinator.entry.entry_id)
+        if member is None:
+            return None, None
+        return member.lag_ms, member.duration_ms
+
+    @callback
+    def _async_arm(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        waiting = [m.next_due for m in self._members.values() if not m.running]
+        if not waiting:
+            return
+        delay = max(0.0, min(waiting) - time.monotonic())
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_tick)
+
+    @callback
+    def _async_tick(self, _now) -> None:
+        self._unsub_timer = None
+        now = time.monotonic()
+        for member in self._members.values():
+            if member.running or member.next_due > now:
+                continue
+            member.running = True
+            self.hass.async_create_background_task(
+                self._async_poll(member, now),
+                f"evse_energy_star poll {member.coordinator.host}",
+            )
+        self._async_arm()
+
+    async def _async_poll(self, member: _Member, started: float) -> None:
+        coordinator = member.coordinator
+        # Недоступна станція не займає спільний пул: один пробний запит на станцію,
+        # тож одна «мертва» не затримує проби інших
+        coordinator.client.limiter = self.limiter if coordinator.last_update_success else member.probe_limiter
+        lag_ms = round((started - member.next_due) * 1000, 1)
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self.stats["in_flight"] -= 1
+            finished = time.monotonic()
+            duration_ms = round((finished - started) * 1000, 1)
+            member.lag_ms = lag_ms
+            member.duration_ms = duration_ms
+            self._record(lag_ms, duration_ms)
+            member.next_due = max(member.next_due + coordinator.effective_interval, finished)
+            member.running = False
+            self._async_arm()
+
+    def _record(self, lag_ms: float, duration_ms: float) -> None:
+        stats = self.stats
+        stats["polls"] += 1
+        stats["max_lag_ms"] = max(stats["max_lag_ms"], lag_ms)
+        for key, value in (("avg_lag_ms", lag_ms), ("avg_duration_ms", duration_ms)):
+            avg = stats[key]
+            stats[key] = value if avg is None else round(avg * 0.9 + value * 0.1, 1)
+        if stats["polls"] % 100 == 0:
+            _LOGGER.debug(
+                "scheduler.py → парк: станцій %s, опитувань %s, середня тривалість %s мс, "
+                "середнє запізнення %s мс, одночасно до %s",
+                len(self._members), stats["polls"], stats["avg_duration_ms"],
+                stats["avg_lag_ms"], stats["max_in_flight"],
+            )
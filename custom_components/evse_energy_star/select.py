@@ -1,12 +1,11 @@
 import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.components.select import SelectEntityDescription
-from .const import DOMAIN
+from .const import DOMAIN, DEFAULT_UPDATE_RATE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,7 +22,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
 class TimeZoneSelect(CoordinatorEntity, SelectEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({"timeZone"}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._attr_translation_key = "time_zone"
@@ -37,39 +36,34 @@ class TimeZoneSelect(CoordinatorEntity, SelectEntity):
 
         self._attr_unique_id = f"time_zone_{config_entry.entry_id}"
         self._attr_options = TIMEZONE_OPTIONS
-        self._attr_current_option = None
+        self._pending = None
 
-        raw = self.coordinator.data.get("timeZone", "0")
-        try:
-            tz_int = int(float(str(raw).strip()))
-            tz_str = str(tz_int)
-        except Exception:
-            tz_str = "0"
+    @property
+    def current_option(self):
+        if self._pending is not None:
+            return self._pending
+        tz = self.coordinator.snapshot.timeZone
+        tz_str = str(tz) if tz is not None else "0"
 
         if tz_str in self._attr_options:
-            self._attr_current_option = tz_str
-            _LOGGER.debug("select.py → timeZone з /init: %s (%s)", tz_str, type(raw).__name__)
-        else:
-            self._attr_current_option = None
-            _LOGGER.warning("select.py → невірне значення timeZone з /init: '%s'", raw)
+            return tz_str
+        _LOGGER.warning("select.py → невірне значення timeZone з /init: '%s'", tz)
+        return None
 
     async def async_select_option(self, option: str):
-        session = async_get_clientsession(self.coordinator.hass)
-        payload = f"isAlarm=false&startTime=None&stopTime=None&timeZone={option}"
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-
+        # Одразу показуємо нове значення, підтверджуємо читанням, інакше відкат
+        self._pending = option
+        self.async_write_ha_state()
         try:
-            await session.post(
-                f"http://{self.coordinator.host}/timer",
-                data=payload,
-                headers=headers
-            )
-            self._attr_current_option = option
-            await self.coordinator.async_request_refresh()
-            self.async_write_ha_state()
+            # Розклад (isAlarm, startTime, stopTime) лишається як є
+            await self.coordinator.timer.async_update(timeZone=int(option))
             _LOGGER.debug("select.py → timeZone змінено на %s через /timer", option)
         except Exception as err:
             _LOGGER.error("select.py → помилка запиту /timer: timeZone=%s → %s", option, repr(err))
+            raise
+        finally:
+            self._pending = None
+            self.async_write_ha_state()
 
     @property
     def available(self):
@@ -102,16 +96,31 @@ class UpdateRateSelect(SelectEntity):
 
         self._attr_unique_id = f"refresh_rate_{config_entry.entry_id}"
         self._attr_options = UPDATE_RATE_OPTIONS
-        self._attr_current_option = str(config_entry.options.get("update_rate", 10))
+        self._published = self.current_option
+
+    @property
+    def current_option(self):
+        # Частоту змінюють і тут, і у формі опцій — джерело одне: застосовані опції координатора
+        return str(self.coordinator.options.get("update_rate", DEFAULT_UPDATE_RATE))
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_options_update))
+
+    @callback
+    def _handle_options_update(self) -> None:
+        # Стан пишемо лише коли частота справді змінилась, а не щоопитування
+        if self.current_option != self._published:
+            self._published = self.current_option
+            self.async_write_ha_state()
 
     async def async_select_option(self, option: str):
         try:
+            # Стан оновиться, коли update_listener застосує опції до координатора
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
                 options={**self.config_entry.options, "update_rate": int(option)}
             )
-            self._attr_current_option = option
-            self.async_write_ha_state()
             _LOGGER.info("select.py → update_rate змінено на %s сек", option)
         except Exception as err:
             _LOGGER.error("select.py → помилка запису update_rate=%s → %s", option, repr(err))
@@ -1,12 +1,16 @@
 import logging
-from datetime import datetime
+import time
+from operator import attrgetter
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
-from .const import DOMAIN, STATUS_MAP
+from homeassistant.const import EntityCategory
+from homeassistant.helpers.event import async_call_later
+from .const import DOMAIN, SAMPLE_KEYS, PUBLISH_FILTER_DEFAULTS
+from .filters import PublishFilter, filter_options
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +35,27 @@ THREE_PHASE_SENSORS = [
     ("voltMeas3", "evse_energy_star_voltage_phase_3", "V", SensorStateClass.MEASUREMENT, SensorDeviceClass.VOLTAGE, None),
 ]
 
+# Діагностика самої інтеграції:
+# (атрибут координатора, ключ перекладу, одиниці, іконка, клас пристрою, крок округлення,
+#  {назва атрибута стану: атрибут координатора})
+# Стан пишеться лише при зміні стану чи атрибутів, тож тут тільки повільні величини;
+# затримки округлені грубо, щоб не давати запис щоцикл (повні дані — в діагностиці)
+DIAGNOSTIC_SENSORS = [
+    ("effective_interval", "evse_energy_star_poll_interval", "s", "mdi:timer-sync-outline", None, None, {}),
+    ("metrics.main_p95_ms", "evse_energy_star_main_latency", "ms", "mdi:timer-outline",
+     SensorDeviceClass.DURATION, 50, {}),
+    ("metrics.init_p95_ms", "evse_energy_star_init_latency", "ms", "mdi:timer-outline",
+     SensorDeviceClass.DURATION, 50, {}),
+    ("metrics.last_success_at", "evse_energy_star_last_success", None, "mdi:clock-check-outline",
+     SensorDeviceClass.TIMESTAMP, None, {}),
+    ("metrics.error_count", "evse_energy_star_poll_errors", None, "mdi:alert-circle-outline", None, None, {
+        "counters": "metrics.counters",
+        "breaker_state": "breaker.state",
+        "breaker_trips": "breaker.trips",
+    }),
+    ("metrics.skipped_ratio", "evse_energy_star_unchanged_responses", "%", "mdi:content-duplicate", None, None, {}),
+]
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
@@ -47,15 +72,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             for key, trans_key, unit, state_class, device_class, _ in THREE_PHASE_SENSORS
         ]
 
+    # Хвилинні агрегати швидких вимірювань: recorder пише раз на хвилину, а не щоопитування
+    entities += [
+        EVSESampleSensor(coordinator, entry, key, trans_key, unit, device_class)
+        for key, trans_key, unit, _, device_class, _ in SENSOR_DEFINITIONS
+        + (THREE_PHASE_SENSORS if device_type == "3_phase" else [])
+        if key in SAMPLE_KEYS
+    ]
+
     entities.append(EVSEGroundStatus(coordinator, entry))
+    entities += [
+        EVSEDiagnosticSensor(coordinator, entry, attr, trans_key, unit, icon, device_class, step, attrs)
+        for attr, trans_key, unit, icon, device_class, step, attrs in DIAGNOSTIC_SENSORS
+    ]
+    entities.append(EVSECommandQueueSensor(coordinator, entry))
     async_add_entities(entities)
 
 class EVSESensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, key, translation_key, unit, state_class, device_class):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({key}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._key = key
+        self._read = attrgetter(key)
         self._attr_translation_key = translation_key
         self._attr_native_unit_of_measurement = unit
         self._attr_state_class = state_class
@@ -65,50 +104,130 @@ class EVSESensor(CoordinatorEntity, SensorEntity):
         self._attr_suggested_object_id = f"{self.coordinator.device_name_slug}_{self._attr_translation_key}"
         self._attr_unique_id = f"{translation_key}_{config_entry.entry_id}"
 
+        # Мертва зона та інтервали публікації — лише для вимірювань
+        group = "leakage" if key == "leakValue" else device_class
+        self._filter = None
+        self._filter_group = None
+        self._filter_generation = coordinator.options_generation
+        self._unsub_flush = None
+        self._flush_at = 0.0
+        self._published_available = None
+        if state_class == SensorStateClass.MEASUREMENT and group in PUBLISH_FILTER_DEFAULTS:
+            self._filter_group = group
+            self._filter = PublishFilter(*filter_options(coordinator.options, group))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Опції фільтрів змінено на льоту — перебудовуємо фільтр
+        if self._filter is not None and self._filter_generation != self.coordinator.options_generation:
+            self._filter_generation = self.coordinator.options_generation
+            self._filter = PublishFilter(*filter_options(self.coordinator.options, self._filter_group))
+        # Зміна доступності чи позначки stale публікується завжди
+        available = (self.available, self.coordinator.stale)
+        if self._filter is None or not self.available or available != self._published_available:
+            self._publish()
+            return
+
+        now = time.monotonic()
+        delay = self._filter.check(self.native_value, now)
+        if delay == 0:
+            self._publish()
+        elif delay is not None and (self._unsub_flush is None or now + delay < self._flush_at):
+            # Зміна в межах мертвої зони або зарано — відкладаємо, а не губимо;
+            # раніший строк (справжня зміна після дрейфу) замінює вже запланований
+            self._cancel_flush()
+            self._flush_at = now + delay
+            self._unsub_flush = async_call_later(self.hass, delay, self._async_flush)
+
+    def _cancel_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        self._unsub_flush = None
+        if self.available:
+            self._publish()
+
+    def _publish(self) -> None:
+        self._cancel_flush()
+        self._published_available = (self.available, self.coordinator.stale)
+        if self._filter is not None:
+            self._filter.mark(self.native_value, time.monotonic())
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._cancel_flush()
+        await super().async_will_remove_from_hass()
+
     @property
     def available(self) -> bool:
         return self.coordinator.last_update_success
 
     @property
     def native_value(self):
-        value = self.coordinator.data.get(self._key)
-        if value is None:
+        # Значення вже перетворене координатором (масштаб, тривалість, статус)
+        return self._read(self.coordinator.snapshot)
+
+    @property
+    def extra_state_attributes(self):
+        # Знімок із диска, станція ще не відповіла
+        return {"stale": True} if self.coordinator.stale else None
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
+            "name": self.config_entry.data.get("device_name", "Eveus Pro"),
+            "manufacturer": "Energy Star",
+            "model": "EVSE",
+            "sw_version": self.coordinator.data.get("fwVersion")
+        }
+
+class EVSESampleSensor(CoordinatorEntity, SensorEntity):
+    """Середнє за останню закриту хвилину; мін/макс/кількість вимірів — в атрибутах."""
+
+    def __init__(self, coordinator, config_entry: ConfigEntry, key, translation_key, unit, device_class):
+        # Без context: хвилина закривається незалежно від того, чи змінилось значення
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self.config_entry = config_entry
+        self._ring = coordinator.samples.rings[key]
+        self._published = None
+        self._attr_translation_key = f"{translation_key}_1m"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_device_class = device_class
+
+        self._attr_has_entity_name = True
+        self._attr_suggested_object_id = f"{self.coordinator.device_name_slug}_{self._attr_translation_key}"
+        self._attr_unique_id = f"{self._attr_translation_key}_{config_entry.entry_id}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Стан пишемо лише при закритті нової хвилини
+        if self._ring.buckets != self._published:
+            self._published = self._ring.buckets
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success and self._ring.bucket is not None
+
+    @property
+    def native_value(self):
+        return self._ring.bucket["mean"] if self._ring.bucket else None
+
+    @property
+    def extra_state_attributes(self):
+        if not self._ring.bucket:
             return None
-        try:
-            if self._key == "curMeas1":
-                return round(float(value) / 10, 2)
-            if self._key in ["sessionEnergy", "totalEnergy"]:
-                return round(float(value) / 10, 3)
-            if self._key == "sessionTime":
-                total_sec = int(float(value))
-                h = total_sec // 3600
-                m = (total_sec % 3600) // 60
-                s = total_sec % 60
-                return f"{h:02}:{m:02}:{s:02}"
-            if self._key == "state":
-                # Повертаємо ключ для перекладу з translations
-                return STATUS_MAP.get(value, "unknown")
-            return value
-        except Exception as err:
-            _LOGGER.warning("sensor.py → помилка в обробці %s: %s", self._key, repr(err))
-            return str(value)
-
-    def _handle_coordinator_update(self):
-        new_value = self.coordinator.data.get(self._key)
-        if self._key == "systemTime":
-            try:
-                old_str = str(self._attr_native_value)
-                new_str = str(new_value)
-                fmt = "%H:%M:%S"
-                old_dt = datetime.strptime(old_str, fmt)
-                new_dt = datetime.strptime(new_str, fmt)
-                if abs((new_dt - old_dt).total_seconds()) <= 2:
-                    return
-            except Exception as err:
-                _LOGGER.debug("sensor.py → systemTime порівняння: %s", repr(err))
-
-        self._attr_native_value = new_value
-        self.async_write_ha_state()
+        return {
+            "min": self._ring.bucket["min"],
+            "max": self._ring.bucket["max"],
+            "samples": self._ring.bucket["samples"],
+        }
 
     @property
     def device_info(self):
@@ -122,7 +241,7 @@ class EVSESensor(CoordinatorEntity, SensorEntity):
 
 class EVSEGroundStatus(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({"ground"}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._attr_translation_key = "evse_energy_star_ground_status"
@@ -137,14 +256,71 @@ class EVSEGroundStatus(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        return "✅" if bool(self.coordinator.data.get("ground", 0)) else "❌"
+        return "✅" if self.coordinator.snapshot.ground else "❌"
 
     @property
     def icon(self):
         return "mdi:checkbox-marked-circle" if self.native_value == "✅" else "mdi:close-circle-outline"
 
-    def _handle_coordinator_update(self):
-        self.async_write_ha_state()
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
+            "name": self.config_entry.data.get("device_name", "Eveus Pro"),
+            "manufacturer": "Energy Star",
+            "model": "EVSE",
+            "sw_version": self.coordinator.data.get("fwVersion")
+        }
+
+class EVSEDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    def __init__(self, coordinator, config_entry: ConfigEntry, attr, translation_key, unit, icon,
+                 device_class=None, step=None, attrs=None):
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self.config_entry = config_entry
+        self._attr = attr
+        self._step = step
+        self._attrs = attrs or {}
+        self._attr_translation_key = translation_key
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        self._attr_device_class = device_class
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._published = None
+
+        self._attr_has_entity_name = True
+        self._attr_suggested_object_id = f"{self.coordinator.device_name_slug}_{self._attr_translation_key}"
+        self._attr_unique_id = f"{translation_key}_{config_entry.entry_id}"
+
+    def _resolve(self, path: str):
+        value = self.coordinator
+        for name in path.split("."):
+            value = getattr(value, name)
+        return value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Пишемо стан лише коли він чи атрибути змінилися — не рядок у recorder на кожне опитування
+        value = (self.native_value, self.extra_state_attributes)
+        if value != self._published:
+            self._published = value
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        # Діагностика лишається доступною й тоді, коли станція недоступна
+        return True
+
+    @property
+    def native_value(self):
+        value = self._resolve(self._attr)
+        if self._step and value is not None:
+            return round(value / self._step) * self._step
+        return round(value) if isinstance(value, float) else value
+
+    @property
+    def extra_state_attributes(self):
+        return {name: self._resolve(path) for name, path in self._attrs.items()} or None
 
     @property
     def device_info(self):
@@ -155,3 +331,14 @@ class EVSEGroundStatus(CoordinatorEntity, SensorEntity):
             "model": "EVSE",
             "sw_version": self.coordinator.data.get("fwVersion")
         }
+
+class EVSECommandQueueSensor(EVSEDiagnosticSensor):
+    """Глибина черги команд — оновлюється самою чергою, а не з опитуванням."""
+
+    def __init__(self, coordinator, config_entry: ConfigEntry):
+        super().__init__(coordinator, config_entry, "commands.depth", "evse_energy_star_command_queue",
+                         None, "mdi:tray-full")
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.commands.async_add_depth_listener(self._handle_coordinator_update))
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from .const import DOMAIN, CURRENT_MIN, CURRENT_MAX, APPLY_MAX_CONCURRENCY
+from .schedule import TIMER_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_APPLY_SETTINGS = "apply_settings"
+
+
+def _hhmm(value) -> str:
+    return cv.time(value).strftime("%H:%M")
+
+
+SETTINGS_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional("currentSet"): vol.All(vol.Coerce(int), vol.Range(min=CURRENT_MIN, max=CURRENT_MAX)),
+        vol.Optional("aiMode"): cv.boolean,
+        vol.Optional("aiVoltage"): vol.All(vol.Coerce(int), vol.Range(min=180, max=240)),
+        vol.Optional("groundCtrl"): cv.boolean,
+        vol.Optional("isAlarm"): cv.boolean,
+        vol.Optional("startTime"): _hhmm,
+        vol.Optional("stopTime"): _hhmm,
+        vol.Optional("timeZone"): vol.All(vol.Coerce(int), vol.Range(min=-12, max=12)),
+    }),
+    vol.Length(min=1),
+)
+
+APPLY_SETTINGS_SCHEMA = vol.Schema({
+    vol.Required("settings"): SETTINGS_SCHEMA,
+    vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("charger"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("all", default=False): cv.boolean,
+})
+
+# aiMode пишеться як aiMode, а читається як aiStatus
+READ_KEYS = {"aiMode": "aiStatus"}
+
+
+def _coordinators(hass: HomeAssistant, call: ServiceCall) -> list:
+    """Станції з device_id і/або charger (host чи entry_id); увесь парк — лише з all: true."""
+    entries = {
+        entry_id: data["coordinator"]
+        for entry_id, data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(data, dict) and "coordinator" in data
+    }
+    device_ids = call.data.get("device_id", [])
+    chargers = call.data.get("charger", [])
+    if call.data["all"]:
+        if device_ids or chargers:
+            raise ServiceValidationError("apply_settings: all: true не поєднується з device_id/charger")
+        return list(entries.values())
+    # Масовий запис без явної цілі — найімовірніше помилка, а не «на всі станції»
+    if not device_ids and not chargers:
+        raise ServiceValidationError("apply_settings: вкажіть device_id, charger або all: true")
+
+    selected = {}
+    for device_id in device_ids:
+        device = dr.async_get(hass).async_get(device_id)
+        if device is None:
+            raise HomeAssistantError(f"невідомий пристрій {device_id}")
+        for entry_id in device.config_entries & entries.keys():
+            selected[entry_id] = entries[entry_id]
+    for charger in chargers:
+        matches = [
+            entry_id for entry_id, coordinator in entries.items()
+            if charger in (entry_id, coordinator.host)
+        ]
+        if not matches:
+            raise HomeAssistantError(f"невідома станція {charger}")
+        for entry_id in matches:
+            selected[entry_id] = entries[entry_id]
+    return list(selected.values())
+
+
+async def _async_apply(coordinator, settings: dict) -> dict:
+    """Усі записи на одну станцію і одна перевірка після них."""
+    started = time.monotonic()
+    page = {key: value for key, value in settings.items() if key not in TIMER_FIELDS}
+    timer = {key: value for key, value in settings.items() if key in TIMER_FIELDS}
+    error = None
+    coordinator.boost_polling()
+    try:
+        # Черга команд сама шле їх по одному з обмеженням частоти; оновлення — одне, нижче
+        writes = [
+            coordinator.commands.async_page_event(
+                key, ("1" if value else "0") if isinstance(value, bool) else value, refresh=False
+            )
+            for key, value in page.items()
+        ]
+        if timer:
+            writes.append(coordinator.timer.async_update(**timer))
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        failures = [repr(result) for result in results if isinstance(result, Exception)]
+        if failures:
+            error = "; ".join(failures)
+        else:
+            # /timer перевіряє себе сам; решту — одним читанням на ендпоінт, за тим,
+            # що справді пішло на станцію (замінені новішим записом не перевіряємо)
+            expected = {
+                READ_KEYS.get(key, key): result.value
+                for key, result in zip(page, results)
+                if not result.superseded
+            }
+            unconfirmed = await coordinator.async_verify_many(expected) if expected else set()
+            if unconfirmed:
+                error = f"станція не застосувала {', '.join(sorted(unconfirmed))}"
+    except Exception as err:
+        error = repr(err)
+    return {
+        "device": coordinator.device_name,
+        "host": coordinator.host,
+        "success": error is None,
+        "error": error,
+        "latency_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_APPLY_SETTINGS):
+        return
+
+    async def _async_apply_settings(call: ServiceCall) -> ServiceResponse:
+        settings = call.data["settings"]
+        coordinators = _coordinators(hass, call)
+        if not coordinators:
+            raise HomeAssistantError("немає станцій для apply_settings")
+        semaphore = asyncio.Semaphore(APPLY_MAX_CONCURRENCY)
+
+        async def _async_bounded(coordinator) -> dict:
+            async with semaphore:
+                return await _async_apply(coordinator, settings)
+
+        results = await asyncio.gather(*(_async_bounded(coordinator) for coordinator in coordinators))
+        failed = [result for result in results if not result["success"]]
+        _LOGGER.info("services.py → apply_settings %s: %s/%s станцій успішно",
+                     settings, len(results) - len(failed), len(results))
+        for result in failed:
+            _LOGGER.warning("services.py → %s (%s): %s", result["device"], result["host"], result["error"])
+        if not call.return_response:
+            if failed:
+                raise HomeAssistantError(
+                    f"apply_settings: не вдалося на {', '.join(result['device'] for result in failed)}"
+                )
+            return None
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SETTINGS,
+        _async_apply_settings,
+        schema=APPLY_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
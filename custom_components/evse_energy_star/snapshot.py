@@ -0,0 +1,99 @@
+import logging
+from .const import STATUS_MAP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _raw(value):
+    return value
+
+
+def _number(value):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _tenths(digits: int):
+    def convert(value):
+        return round(float(value) / 10, digits)
+    return convert
+
+
+def _flag(value) -> bool:
+    return str(value).lower() in ("true", "1")
+
+
+def _duration(value) -> str:
+    total_sec = int(float(value))
+    h = total_sec // 3600
+    m = (total_sec % 3600) // 60
+    s = total_sec % 60
+    return f"{h:02}:{m:02}:{s:02}"
+
+
+def _status(value) -> str:
+    # Повертаємо ключ для перекладу з translations
+    return STATUS_MAP.get(value, "unknown")
+
+
+def _time_zone(value) -> int:
+    return int(float(str(value).strip()))
+
+
+# Ключ із /init або /main → перетворення сирого значення у готове для сутностей
+CONVERTERS = {
+    "state": _status,
+    "currentSet": _number,
+    "curDesign": _number,
+    "aiVoltage": _number,
+    "curMeas1": _tenths(2),
+    "curMeas2": _raw,
+    "curMeas3": _raw,
+    "voltMeas1": _raw,
+    "voltMeas2": _raw,
+    "voltMeas3": _raw,
+    "temperature1": _raw,
+    "temperature2": _raw,
+    "leakValue": _raw,
+    "sessionEnergy": _tenths(3),
+    "totalEnergy": _tenths(3),
+    "sessionTime": _duration,
+    "systemTime": _raw,
+    "ground": _flag,
+    "groundCtrl": _flag,
+    "aiStatus": _flag,
+    "oneCharge": _flag,
+    "isAlarm": _flag,
+    "timeZone": _time_zone,
+    "startTime": str,
+    "stopTime": str,
+    "fwVersion": _raw,
+}
+
+
+class EVSESnapshot:
+    """Декодований стан станції: одне поле на ключ, без словника на екземплярі.
+
+    Координатор перетворює лише змінені ключі, сутності тільки читають готові значення.
+    """
+
+    __slots__ = tuple(CONVERTERS)
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def update(self, data: dict, keys) -> None:
+        for key in keys:
+            convert = CONVERTERS.get(key)
+            if convert is None:
+                continue
+            value = data.get(key)
+            if value is None:
+                setattr(self, key, None)
+                continue
+            try:
+                setattr(self, key, convert(value))
+            except Exception as err:
+                _LOGGER.warning("snapshot.py → помилка в обробці %s: %s", key, repr(err))
+                setattr(self, key, str(value))
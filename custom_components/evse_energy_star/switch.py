@@ -2,7 +2,7 @@ import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,12 +26,15 @@ async def async_setup_entry(hass, entry: ConfigEntry, async_add_entities: AddEnt
 
     async_add_entities(entities)
 
-class EVSESwitch(SwitchEntity):
+class EVSESwitch(CoordinatorEntity, SwitchEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, key, translation_key):
+        source_key = "currentSet" if key == "restrictedMode" else key
+        super().__init__(coordinator, context=frozenset({source_key}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._host = coordinator.host
         self._key = key
+        self._pending = None
         self._attr_translation_key = translation_key
         self._attr_unique_id = f"{translation_key}_{config_entry.entry_id}"
         self._attr_has_entity_name = True
@@ -43,46 +46,52 @@ class EVSESwitch(SwitchEntity):
 
     @property
     def is_on(self):
+        if self._pending is not None:
+            return self._pending
         if self._key == "restrictedMode":
-            return float(self.coordinator.data.get("currentSet", 32)) <= 16
-        return bool(self.coordinator.data.get(self._key))
+            return self._current_set() <= 16
+        return bool(getattr(self.coordinator.snapshot, self._key))
 
     async def async_turn_on(self):
         if self._key == "restrictedMode":
-            await self._set_current_if_needed(12, only_if_high=True)
+            await self._set_current_if_needed(True, 12, only_if_high=True)
         else:
             await self._send_event(True)
 
     async def async_turn_off(self):
         if self._key == "restrictedMode":
-            await self._set_current_if_needed(16, only_if_low=True)
+            await self._set_current_if_needed(False, 16, only_if_low=True)
         else:
             await self._send_event(False)
 
-    async def _send_event(self, state: bool):
-        payload = f"{self._key}={'1' if state else '0'}"
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "pageEvent": self._key
-        }
-        session = async_get_clientsession(self.coordinator.hass)
+    def _current_set(self):
+        current = self.coordinator.snapshot.currentSet
+        return current if current is not None else 32
+
+    async def _write_optimistic(self, state: bool, key: str, value):
+        # Одразу показуємо нове значення, підтверджуємо читанням /main, інакше відкат
+        self._pending = state
+        self.async_write_ha_state()
         try:
-            await session.post(f"http://{self._host}/pageEvent", data=payload, headers=headers)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_verified(
+                key, value, self.coordinator.commands.async_page_event(key, value, refresh=False)
+            )
         except Exception as err:
-            _LOGGER.error("switch.py → помилка запиту %s → %s", self._key, repr(err))
+            _LOGGER.error("switch.py → помилка запиту %s → %s", key, repr(err))
+            raise
+        finally:
+            # Новіший запис цієї ж сутності вже показує своє значення — його не чіпаємо
+            if self._pending == state:
+                self._pending = None
+                self.async_write_ha_state()
 
-    async def _set_current_if_needed(self, target, only_if_high=False, only_if_low=False):
-        current = float(self.coordinator.data.get("currentSet", 32))
+    async def _send_event(self, state: bool):
+        await self._write_optimistic(state, self._key, '1' if state else '0')
+
+    async def _set_current_if_needed(self, state: bool, target, only_if_high=False, only_if_low=False):
+        current = self._current_set()
         if (only_if_high and current > target) or (only_if_low and current <= target):
-            payload = f"currentSet={target}"
-            headers = {
-                "Content-Type": "application/x-www-form-urlencoded",
-                "pageEvent": "currentSet"
-            }
-            session = async_get_clientsession(self.coordinator.hass)
-            await session.post(f"http://{self._host}/pageEvent", data=payload, headers=headers)
-            await self.coordinator.async_request_refresh()
+            await self._write_optimistic(state, "currentSet", target)
 
     @property
     def device_info(self):
@@ -94,11 +103,13 @@ class EVSESwitch(SwitchEntity):
             "sw_version": self.coordinator.data.get("fwVersion")
         }
 
-class EVSEScheduleSwitch(SwitchEntity):
+class EVSEScheduleSwitch(CoordinatorEntity, SwitchEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry):
+        super().__init__(coordinator, context=frozenset({"isAlarm"}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._host = coordinator.host
+        self._pending = None
         self._attr_translation_key = "evse_energy_star_schedule"
         self._attr_unique_id = f"schedule_{config_entry.entry_id}"
         self._attr_has_entity_name = True
@@ -110,8 +121,9 @@ class EVSEScheduleSwitch(SwitchEntity):
 
     @property
     def is_on(self):
-        value = self.coordinator.data.get("isAlarm")
-        return str(value).lower() in ["true", "1"]
+        if self._pending is not None:
+            return self._pending
+        return bool(self.coordinator.snapshot.isAlarm)
 
     async def async_turn_on(self):
         await self._send(True)
@@ -120,25 +132,19 @@ class EVSEScheduleSwitch(SwitchEntity):
         await self._send(False)
 
     async def _send(self, state: bool):
-        data = self.coordinator.data
-        if not data:
-            _LOGGER.warning("switch.py → coordinator.data порожній, розклад не оновлено")
-            return
-
-        payload = (
-            f"isAlarm={'true' if state else 'false'}&"
-            f"startTime={data.get('startTime')}&"
-            f"stopTime={data.get('stopTime')}&"
-            f"timeZone={data.get('timeZone')}"
-        )
-        session = async_get_clientsession(self.coordinator.hass)
+        self._pending = state
+        self.async_write_ha_state()
         try:
-            await session.post(f"http://{self._host}/timer", data=payload, headers={
-                "Content-Type": "application/x-www-form-urlencoded"
-            })
-            await self.coordinator.async_request_refresh()
+            # Решту полів /timer підставить і перевірить спільний обʼєкт розкладу
+            await self.coordinator.timer.async_update(isAlarm=state)
         except Exception as err:
             _LOGGER.error("switch.py → помилка оновлення розкладу → %s", repr(err))
+            raise
+        finally:
+            # Новіший запис цієї ж сутності вже показує своє значення — його не чіпаємо
+            if self._pending == state:
+                self._pending = None
+                self.async_write_ha_state()
 
     @property
     def device_info(self):
@@ -150,12 +156,16 @@ class EVSEScheduleSwitch(SwitchEntity):
             "sw_version": self.coordinator.data.get("fwVersion")
         }
 
-class EVSESimpleSwitch(SwitchEntity):
+class EVSESimpleSwitch(CoordinatorEntity, SwitchEntity):
     def __init__(self, coordinator, config_entry: ConfigEntry, key, translation_key):
+        source_key = "aiStatus" if key == "aiMode" else key
+        super().__init__(coordinator, context=frozenset({source_key}))
         self.coordinator = coordinator
         self.config_entry = config_entry
         self._host = coordinator.host
         self._key = key
+        self._source_key = source_key
+        self._pending = None
         self._attr_translation_key = translation_key
         self._attr_unique_id = f"{translation_key}_{config_entry.entry_id}"
         self._attr_has_entity_name = True
@@ -167,11 +177,10 @@ class EVSESimpleSwitch(SwitchEntity):
 
     @property
     def is_on(self):
-        if self._key == "aiMode":
-            val = self.coordinator.data.get("aiStatus")
-        else:
-            val = self.coordinator.data.get(self._key)
-        return str(val).lower() in ["true", "1"]
+        if self._pending is not None:
+            return self._pending
+        # aiMode читається з aiStatus
+        return bool(getattr(self.coordinator.snapshot, self._source_key))
 
     async def async_turn_on(self):
         await self._send(True)
@@ -180,17 +189,22 @@ class EVSESimpleSwitch(SwitchEntity):
         await self._send(False)
 
     async def _send(self, state: bool):
-        payload = f"{self._key}={'1' if state else '0'}"
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "pageEvent": self._key
-        }
-        session = async_get_clientsession(self.coordinator.hass)
+        # aiMode пишеться як aiMode, а читається як aiStatus
+        value = '1' if state else '0'
+        self._pending = state
+        self.async_write_ha_state()
         try:
-            await session.post(f"http://{self._host}/pageEvent", data=payload, headers=headers)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_verified(
+                self._source_key, value, self.coordinator.commands.async_page_event(self._key, value, refresh=False)
+            )
         except Exception as err:
             _LOGGER.error("switch.py → помилка запиту %s → %s", self._key, repr(err))
+            raise
+        finally:
+            # Новіший запис цієї ж сутності вже показує своє значення — його не чіпаємо
+            if self._pending == state:
+                self._pending = None
+                self.async_write_ha_state()
 
     @property
     def device_info(self):
@@ -0,0 +1,172 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .client import EVSEClient, EVSEResponse
+from .const import TRACE_MAX_BYTES, TRACE_BACKUPS, TRACE_FLUSH_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EVSETraceRecorder:
+    """Сирі запити й відповіді станції у gzip JSON Lines з ротацією за розміром.
+
+    Рядки накопичуються в памʼяті і скидаються на диск у executor не частіше
+    ніж раз на TRACE_FLUSH_INTERVAL сек, тож цикл подій не чекає на диск.
+    Кожне скидання — окремий gzip-член; такий файл читає звичайний gzip.open.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, max_bytes: int = TRACE_MAX_BYTES,
+                 backups: int = TRACE_BACKUPS):
+        self.hass = hass
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._buffer: list[str] = []
+        self._unsub_flush = None
+        # Запис, що ще виконується в executor, — async_close дочекається його
+        self._writing = None
+        self.records = 0
+
+    @callback
+    def record(self, path: str, request: str | None, response: EVSEResponse | None = None,
+               error: Exception | None = None) -> None:
+        line = {"ts": round(time.time(), 3), "path": path, "request": request}
+        if response is not None:
+            line.update(
+                status=response.status,
+                content_type=response.content_type,
+                body=response.body.decode("utf-8", "replace"),
+            )
+        if error is not None:
+            line["error"] = repr(error)
+        self._buffer.append(json.dumps(line, ensure_ascii=False))
+        self.records += 1
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, TRACE_FLUSH_INTERVAL, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now=None) -> None:
+        self._unsub_flush = None
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        self._writing = self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self._max_bytes:
+                self._rotate()
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+        except OSError as err:
+            _LOGGER.warning("trace.py → не вдалося записати %s: %s", self.path, repr(err))
+
+    def _rotate(self) -> None:
+        for index in range(self._backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    async def async_close(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._writing is not None:
+            await self._writing
+            self._writing = None
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            await self.hass.async_add_executor_job(self._write, lines)
+
+
+def read_trace(path: str) -> list[dict]:
+    """Записи трасування від найстарішого (з урахуванням ротованих файлів path.N)."""
+    paths = [f"{path}.{index}" for index in range(TRACE_BACKUPS, 0, -1)] + [path]
+    records = []
+    for name in paths:
+        if not os.path.exists(name):
+            continue
+        with gzip.open(name, "rt", encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    return records
+
+
+class EVSEReplayClient:
+    """Замінник EVSEClient, що відтворює записане трасування замість мережі.
+
+    /init і /main повертають наступну записану відповідь для свого шляху,
+    чекаючи, поки годинник відтворення (speed× від реального) дійде до її
+    мітки часу; speed=0 — без очікування. Записані помилки відтворюються як
+    aiohttp.ClientError. Команди не йдуть нікуди й отримують 200.
+    """
+
+    def __init__(self, hass: HomeAssistant, records: list[dict], speed: float = 1.0):
+        self.hass = hass
+        self.host = "replay"
+        self.limiter = None
+        self.recorder = None
+        self.read_timeout = 0.0
+        self.reuse_ratio = None
+        self._speed = speed
+        self._queues: dict[str, list[dict]] = {}
+        for record in records:
+            self._queues.setdefault(record["path"], []).append(record)
+        for queue in self._queues.values():
+            queue.reverse()
+        self._origin = records[0]["ts"] if records else 0.0
+        self._started = None
+        self.commands: list[tuple[str, str | None]] = []
+        self.stats = {"requests": 0, "errors": 0, "connections_created": 0, "connections_reused": 0}
+
+    @property
+    def exhausted(self) -> bool:
+        return self.next_path is None
+
+    @property
+    def next_path(self) -> str | None:
+        """Який з /init чи /main записаний наступним."""
+        heads = [(queue[-1]["ts"], path) for path, queue in self._queues.items()
+                 if path in ("init", "main") and queue]
+        return min(heads)[1] if heads else None
+
+    async def async_request(self, path: str, *, data=None, json=None, headers=None) -> EVSEResponse:
+        self.stats["requests"] += 1
+        queue = self._queues.get(path)
+        if path not in ("init", "main"):
+            self.commands.append((path, EVSEClient._request_text(data, json)))
+            return EVSEResponse(200, "text/plain", b"OK")
+        if not queue:
+            self.stats["errors"] += 1
+            raise aiohttp.ClientConnectionError(f"трасування вичерпано: /{path}")
+
+        record = queue.pop()
+        if self._speed:
+            if self._started is None:
+                self._started = time.monotonic()
+            due = self._started + (record["ts"] - self._origin) / self._speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if "error" in record and "status" not in record:
+            self.stats["errors"] += 1
+            raise aiohttp.ClientError(record["error"])
+        return EVSEResponse(record["status"], record.get("content_type", ""), record.get("body", "").encode("utf-8"))
+
+    async def async_post_form(self, path: str, payload: str, headers: dict | None = None) -> EVSEResponse:
+        return await self.async_request(path, data=payload, headers=headers)
+
+    async def async_page_event(self, key: str, value) -> EVSEResponse:
+        return await self.async_post_form("pageEvent", f"{key}={value}", {"pageEvent": key})
+
+    async def async_post_timer(self, payload: str) -> EVSEResponse:
+        return await self.async_post_form("timer", payload)
+
+    async def async_close(self) -> None:
+        """Мережі немає — закривати нічого."""
@@ -0,0 +1,37 @@
+"""Розподіл спільного ліміту вводу між станціями групи."""
+from types import SimpleNamespace
+
+from custom_components.evse_energy_star.allocator import _Member, allocate
+from custom_components.evse_energy_star.const import CURRENT_MIN
+
+
+def _member(state, priority=0, phases=1, supply_phase=1, enabled=1):
+    snapshot = SimpleNamespace(state=state, curDesign=32, curMeas1=None, curMeas2=None, curMeas3=None,
+                               currentSet=16)
+    coordinator = SimpleNamespace(snapshot=snapshot, data={"evseEnabled": enabled}, phase_count=phases)
+    return _Member(coordinator, {"supply_group": "g", "supply_priority": priority, "supply_phase": supply_phase})
+
+
+def test_idle_and_disabled_members_get_nothing():
+    charging, waiting, disabled = _member("charging"), _member("waiting"), _member("charging", enabled=0)
+    result, headroom = allocate([charging, waiting, disabled], 20)
+    assert set(result) == {charging}
+    # Мінімум неактивних станцій не забирає запас у тієї, що заряджає
+    assert result[charging] == 20
+    assert headroom == 0
+
+
+def test_three_phase_member_loads_every_phase():
+    three, single = _member("charging", phases=3), _member("charging", supply_phase=2)
+    result, _ = allocate([three, single], 20)
+    assert three.phases == (0, 1, 2)
+    assert single.phases == (1,)
+    assert result[three] + result[single] <= 20
+    assert result[three] == result[single] == 10
+
+
+def test_priority_served_first():
+    high, low = _member("charging", priority=1), _member("ready")
+    result, _ = allocate([high, low], 20)
+    assert result[low] == CURRENT_MIN
+    assert result[high] == 20 - CURRENT_MIN
@@ -0,0 +1,62 @@
+"""Кнопка «Зарядити зараз»: chargeNow іде на станцію навіть без відомого /timer."""
+import asyncio
+from types import SimpleNamespace
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.evse_energy_star.button import ChargeNowButton
+from custom_components.evse_energy_star.schedule import EVSETimerState
+
+
+class _Commands:
+    def __init__(self):
+        self.sent = []
+
+    async def async_send(self, path, key, payload, headers=None, refresh=True):
+        self.sent.append(payload)
+
+    async def async_post_timer(self, payload, refresh=True):
+        self.sent.append(payload)
+
+
+def _press(snapshot):
+    async def _run():
+        loop = asyncio.get_running_loop()
+        hass = SimpleNamespace(async_create_background_task=lambda coro, name: loop.create_task(coro))
+        coordinator = SimpleNamespace(hass=hass, host="test", device_name="Test", snapshot=snapshot,
+                                      commands=_Commands())
+        coordinator.timer = EVSETimerState(coordinator)
+
+        async def _fetch_init():
+            # Станція прийняла /timer — /init показує записане
+            snapshot.isAlarm = False
+            return {}
+
+        coordinator.boost_polling = lambda: None
+        coordinator.async_fetch_init = _fetch_init
+        button = ChargeNowButton(coordinator, SimpleNamespace(entry_id="entry"), "test")
+        try:
+            await button.async_press()
+            return coordinator.commands.sent, None
+        except HomeAssistantError as err:
+            return coordinator.commands.sent, err
+
+    return asyncio.run(_run())
+
+
+def test_charge_now_sent_when_timer_unknown():
+    # Свіжий запуск: /init ще не прочитано, поля /timer невідомі
+    snapshot = SimpleNamespace(isAlarm=None, startTime=None, stopTime=None, timeZone=None)
+    sent, err = _press(snapshot)
+    assert "chargeNow=12" in sent
+    assert not any(payload.startswith("isAlarm") for payload in sent)
+    # Розклад не вимкнено — користувач має про це дізнатись
+    assert err is not None
+
+
+def test_charge_now_disables_known_schedule():
+    snapshot = SimpleNamespace(isAlarm=True, startTime="23:00", stopTime="07:00", timeZone=2)
+    sent, err = _press(snapshot)
+    assert err is None
+    assert "isAlarm=false&startTime=23:00&stopTime=07:00&timeZone=2" in sent
+    assert sent[-1] == "chargeNow=12"
@@ -0,0 +1,44 @@
+"""Регулятор currentSet за сенсором мережі: гістерезис при підвищенні."""
+from types import SimpleNamespace
+
+from custom_components.evse_energy_star.const import CONTROLLER_HYSTERESIS
+from custom_components.evse_energy_star.controller import EVSECurrentController
+
+
+def _controller(grid_amps):
+    writes = []
+    state = SimpleNamespace(state=str(grid_amps), attributes={"unit_of_measurement": "A"})
+
+    def _background_task(coro, name):
+        coro.close()
+
+    hass = SimpleNamespace(states=SimpleNamespace(get=lambda entity_id: state),
+                           async_create_background_task=_background_task)
+    snapshot = SimpleNamespace(curMeas1=16, curDesign=32, currentSet=16, voltMeas1=230)
+    coordinator = SimpleNamespace(hass=hass, snapshot=snapshot, last_update_success=True, stale=False,
+                                  phase_count=1, device_name="Test", host="test")
+    controller = EVSECurrentController(coordinator, {"grid_sensor": "sensor.grid", "grid_limit": 32})
+    controller._write = lambda value, now, started: writes.append(value)
+    # Станція давно на поточному рівні — витримка не заважає
+    controller._changed_at = controller._written_at = -1000.0
+    return controller, writes
+
+
+def test_small_headroom_does_not_step_up():
+    # Будинок без станції бере 14.7 А: запас 17.3 А при уставці 16 А
+    controller, writes = _controller(30.7)
+    controller._evaluate(0.0)
+    assert writes == []
+
+
+def test_headroom_past_hysteresis_steps_up():
+    # Запас 17 А + гістерезис — можна підняти на 1 А
+    controller, writes = _controller(32 - 17 - CONTROLLER_HYSTERESIS + 16)
+    controller._evaluate(0.0)
+    assert writes == [17]
+
+
+def test_step_down_is_immediate():
+    controller, writes = _controller(34.2)
+    controller._evaluate(0.0)
+    assert writes == [13]
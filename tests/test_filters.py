@@ -0,0 +1,116 @@
+"""Фільтр публікації сенсорів: мертва зона, мін./макс. інтервал, перепланування."""
+from types import SimpleNamespace
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from custom_components.evse_energy_star import sensor as sensor_module
+from custom_components.evse_energy_star.filters import PublishFilter
+
+
+def test_first_value_published_immediately():
+    assert PublishFilter("2", 10, 300).check(230, 0) == 0
+
+
+def test_same_value_skipped():
+    publish_filter = PublishFilter("2", 10, 300)
+    publish_filter.mark(230, 0)
+    assert publish_filter.check(230, 5) is None
+
+
+def test_change_within_deadband_waits_for_max_interval():
+    publish_filter = PublishFilter("2", 10, 300)
+    publish_filter.mark(230, 0)
+    assert publish_filter.check(231, 2) == 298
+
+
+def test_change_within_deadband_dropped_without_max_interval():
+    publish_filter = PublishFilter("2", 10, 0)
+    publish_filter.mark(230, 0)
+    assert publish_filter.check(231, 2) is None
+
+
+def test_change_above_deadband_respects_min_interval():
+    publish_filter = PublishFilter("2", 10, 300)
+    publish_filter.mark(230, 0)
+    assert publish_filter.check(240, 5) == 5
+    assert publish_filter.check(240, 12) == 0
+
+
+def test_percent_deadband():
+    publish_filter = PublishFilter("5%", 0, 0)
+    publish_filter.mark(100, 0)
+    assert publish_filter.check(104, 1) is None
+    assert publish_filter.check(106, 1) == 0
+
+
+def test_non_numeric_value_published():
+    publish_filter = PublishFilter("2", 10, 300)
+    publish_filter.mark(230, 0)
+    assert publish_filter.check("n/a", 1) == 0
+
+
+def _voltage_sensor(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    scheduled = []
+
+    def _call_later(hass, delay, action):
+        handle = SimpleNamespace(delay=delay, cancelled=False)
+        scheduled.append(handle)
+
+        def _cancel():
+            handle.cancelled = True
+
+        return _cancel
+
+    monkeypatch.setattr(sensor_module, "async_call_later", _call_later)
+    monkeypatch.setattr(sensor_module.time, "monotonic", lambda: clock.now)
+    coordinator = SimpleNamespace(
+        snapshot=SimpleNamespace(voltMeas1=230), options={}, options_generation=0,
+        device_name_slug="test", last_update_success=True, stale=False,
+    )
+    entity = sensor_module.EVSESensor(
+        coordinator, SimpleNamespace(entry_id="entry"), "voltMeas1", "evse_energy_star_voltage_phase_1",
+        "V", SensorStateClass.MEASUREMENT, SensorDeviceClass.VOLTAGE,
+    )
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(coordinator.snapshot.voltMeas1)
+    return entity, coordinator, clock, scheduled, writes
+
+
+def test_real_change_replaces_pending_max_interval_flush(monkeypatch):
+    entity, coordinator, clock, scheduled, writes = _voltage_sensor(monkeypatch)
+    entity._handle_coordinator_update()
+    assert writes == [230]
+
+    # Дрейф у межах мертвої зони — відкладено до макс. інтервалу
+    clock.now, coordinator.snapshot.voltMeas1 = 2.0, 231
+    entity._handle_coordinator_update()
+    assert [handle.delay for handle in scheduled] == [298]
+
+    # Справжня зміна: мін. інтервал спливає через 5 с — раніше за 298 с
+    clock.now, coordinator.snapshot.voltMeas1 = 5.0, 240
+    entity._handle_coordinator_update()
+    assert scheduled[0].cancelled
+    assert scheduled[1].delay == 5
+    assert writes == [230]
+
+
+def test_later_deadline_keeps_pending_flush(monkeypatch):
+    entity, coordinator, clock, scheduled, writes = _voltage_sensor(monkeypatch)
+    entity._handle_coordinator_update()
+    clock.now, coordinator.snapshot.voltMeas1 = 5.0, 240
+    entity._handle_coordinator_update()
+    clock.now, coordinator.snapshot.voltMeas1 = 6.0, 230.5
+    entity._handle_coordinator_update()
+    assert len(scheduled) == 1 and not scheduled[0].cancelled
+
+
+def test_publishes_immediately_when_due(monkeypatch):
+    entity, coordinator, clock, scheduled, writes = _voltage_sensor(monkeypatch)
+    entity._handle_coordinator_update()
+    clock.now, coordinator.snapshot.voltMeas1 = 2.0, 231
+    entity._handle_coordinator_update()
+    clock.now, coordinator.snapshot.voltMeas1 = 12.0, 240
+    entity._handle_coordinator_update()
+    assert scheduled[0].cancelled
+    assert writes == [230, 240]
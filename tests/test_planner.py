@@ -0,0 +1,118 @@
+"""Планувальник зарядки за тарифом: пошук вікна і стабільність плану."""
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.evse_energy_star.planner import (
+    EVSETariffPlanner,
+    cheapest_window,
+    parse_forecast,
+    slot_step,
+)
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def _slots(prices, skip=()):
+    return [(BASE + i * HOUR, price) for i, price in enumerate(prices) if i not in skip]
+
+
+def _brute_force(slots, width):
+    step = slot_step(slots)
+    best = None
+    for i in range(len(slots) - width + 1):
+        window = slots[i:i + width]
+        if any(b[0] - a[0] != step for a, b in zip(window, window[1:])):
+            continue
+        total = sum(price for _, price in window)
+        if best is None or total < best[0] - 1e-12:
+            best = (total, window[0][0], window[-1][0] + step)
+    return best
+
+
+def test_step_ignores_gap_after_first_slot():
+    # 00:00, потім дірка до 04:00 — крок усе одно година
+    slots = _slots([1, 9, 9, 9, 5, 5, 5, 5, 5], skip=(1, 2, 3))
+    assert slot_step(slots) == HOUR
+
+
+def test_window_never_spans_gap():
+    slots = _slots([1, 9, 9, 9, 5, 5, 5, 5, 5], skip=(1, 2, 3))
+    start, stop, avg = cheapest_window(slots, 4)
+    assert (start, stop) == (BASE + 4 * HOUR, BASE + 8 * HOUR)
+    assert avg == 5
+
+
+def test_window_none_when_no_contiguous_run_fits():
+    slots = _slots([1, 1, 1, 1, 1], skip=(2,))
+    assert cheapest_window(slots, 3) is None
+
+
+def test_window_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(3, 48)
+        skip = set(rng.sample(range(n), rng.randint(0, n // 4)))
+        slots = _slots([rng.random() for _ in range(n)], skip)
+        width = rng.randint(1, 6)
+        expected = _brute_force(slots, width)
+        result = cheapest_window(slots, width)
+        if expected is None:
+            assert result is None
+        else:
+            assert (result[0], result[1]) == expected[1:]
+            assert abs(result[2] * width - expected[0]) < 1e-9
+
+
+def test_parse_forecast_variants():
+    slots = parse_forecast([
+        {"startsAt": "2026-01-01T01:00:00+00:00", "total": "0.2"},
+        {"start": BASE, "value": 0.1},
+        {"time": "bad", "price": 1},
+        "junk",
+    ])
+    assert slots == [(BASE, 0.1), (BASE + HOUR, 0.2)]
+
+
+def _planner(prices, session_energy=None, state="waiting"):
+    attributes = {"prices": [{"start": start.isoformat(), "value": price} for start, price in prices]}
+    sensor = SimpleNamespace(state="1", attributes=attributes)
+    tasks = []
+
+    def _create_task(coro, name):
+        tasks.append(name)
+        coro.close()
+
+    hass = SimpleNamespace(states=SimpleNamespace(get=lambda entity_id: sensor),
+                           async_create_background_task=_create_task)
+    snapshot = SimpleNamespace(curDesign=16, currentSet=16, voltMeas1=250, state=state,
+                               sessionEnergy=session_energy)
+    coordinator = SimpleNamespace(hass=hass, snapshot=snapshot, phase_count=1,
+                                  stale=False, device_name="Test", host="test")
+    planner = EVSETariffPlanner(coordinator, {"price_sensor": "sensor.price", "target_energy": 16})
+    return planner, tasks
+
+
+def test_same_forecast_is_not_replanned_as_hours_pass(monkeypatch):
+    # 4 кВт, 16 кВт·год — 4 години; найдешевші 02:00–06:00
+    prices = _slots([5, 5, 1, 1, 1, 1, 3, 3, 3, 3, 9, 9])
+    planner, tasks = _planner(prices)
+    for hour in range(4):
+        monkeypatch.setattr(dt_util, "utcnow", lambda hour=hour: BASE + (2 + hour) * HOUR)
+        planner._async_replan()
+    assert len(tasks) == 1
+    assert planner.plan["start"] == (BASE + 2 * HOUR).isoformat()
+    assert planner.plan["stop"] == (BASE + 6 * HOUR).isoformat()
+
+
+def test_plans_only_remaining_session_energy(monkeypatch):
+    monkeypatch.setattr(dt_util, "utcnow", lambda: BASE)
+    prices = _slots([5, 5, 1, 1, 1, 1, 3, 3])
+    planner, tasks = _planner(prices, session_energy=12, state="charging")
+    planner._async_replan()
+    # Лишилось 4 кВт·год — одна година
+    assert planner.plan["energy_kwh"] == 4
+    assert planner.plan["stop"] == (BASE + 3 * HOUR).isoformat()
@@ -0,0 +1,290 @@
+"""Бенчмарки гарячих шляхів інтеграції: опитування, декодування, розсилка, команди.
+
+Запускається проти імітатора станцій (tools/evse_simulator.py), потребує
+встановленого homeassistant. Результат — JSON; з --baseline порівнює з
+попереднім прогоном і завершується з кодом 1, якщо щось повільніше за поріг:
+
+    python tools/benchmark.py --output bench.json
+    python tools/benchmark.py --baseline bench.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.evse_energy_star.coordinator import EVSECoordinator  # noqa: E402
+from custom_components.evse_energy_star.sensor import (  # noqa: E402
+    EVSESensor,
+    SENSOR_DEFINITIONS,
+    THREE_PHASE_SENSORS,
+)
+from evse_simulator import FaultConfig, SimulatedCharger, start_fleet, stop_fleet  # noqa: E402
+
+FLEET_SIZES = (1, 10, 100)
+LAYOUTS = {"1_phase": 1, "3_phase": 3}
+
+
+def _make_entry(host: str, device_type: str) -> ConfigEntry:
+    kwargs = dict(
+        version=1,
+        domain="evse_energy_star",
+        title=host,
+        data={"host": host, "device_name": f"bench {host}", "device_type": device_type},
+        source="user",
+        options={"update_rate": 1},
+    )
+    if "minor_version" in inspect.signature(ConfigEntry.__init__).parameters:
+        kwargs["minor_version"] = 1
+    return ConfigEntry(**kwargs)
+
+
+class _OfflineClient:
+    """Клієнт без мережі для decode/fanout: дані подаються напряму, станцій немає."""
+
+    recorder = None
+    limiter = None
+    stats = {"connections_created": 0}
+
+    async def async_request(self, *args, **kwargs):
+        raise RuntimeError("offline benchmark client")
+
+    async def async_post_form(self, *args, **kwargs):
+        raise RuntimeError("offline benchmark client")
+
+    async def async_close(self) -> None:
+        pass
+
+
+class _IdleScheduler:
+    """Замість планувальника парку: координатор без власного таймера, опитувань немає."""
+
+    limiter = None
+
+    def async_reschedule(self, coordinator) -> None:
+        pass
+
+    def member_stats(self, coordinator) -> tuple:
+        return None, None
+
+
+def _offline_coordinator(hass: HomeAssistant, host: str, entry: ConfigEntry) -> EVSECoordinator:
+    return EVSECoordinator(hass, host, entry, _IdleScheduler(), _OfflineClient())
+
+
+def _summary(samples: list[float]) -> dict:
+    """Мікросекунди: медіана, p95, середнє."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "p50_us": round(statistics.median(ordered) * 1e6, 2),
+        "p95_us": round(p95 * 1e6, 2),
+        "mean_us": round(statistics.fmean(ordered) * 1e6, 2),
+        "n": len(ordered),
+    }
+
+
+def _payload(charger: SimulatedCharger) -> dict:
+    charger.tick(1.0)
+    return {**charger.init_payload(), **charger.main_payload()}
+
+
+def _sensor_definitions(phases: int) -> list:
+    return SENSOR_DEFINITIONS + (THREE_PHASE_SENSORS if phases == 3 else [])
+
+
+async def bench_poll(hass: HomeAssistant, iterations: int) -> dict:
+    """Повний цикл _async_update_data (/main кожного разу, /init — за розкладом)."""
+    results = {}
+    for layout, phases in LAYOUTS.items():
+        servers = await start_fleet(1, 18900 + phases, FaultConfig(), phases=phases, seed=1)
+        coordinator = EVSECoordinator(hass, servers[0].address, _make_entry(servers[0].address, layout))
+        try:
+            await coordinator._async_update_data()
+            samples = []
+            for index in range(iterations):
+                if index % 10 == 0:
+                    coordinator.request_init_refresh()
+                started = time.perf_counter()
+                await coordinator._async_update_data()
+                samples.append(time.perf_counter() - started)
+            results[layout] = _summary(samples)
+        finally:
+            await coordinator.async_shutdown()
+            await stop_fleet(servers)
+    return results
+
+
+async def bench_decode(hass: HomeAssistant, iterations: int) -> dict:
+    """Декодування знімка і читання EVSESensor.native_value для всіх сенсорів."""
+    results = {}
+    for layout, phases in LAYOUTS.items():
+        charger = SimulatedCharger(phases, seed=2)
+        entry = _make_entry("127.0.0.1:1", layout)
+        coordinator = _offline_coordinator(hass, "127.0.0.1:1", entry)
+        try:
+            sensors = [
+                EVSESensor(coordinator, entry, key, trans_key, unit, state_class, device_class)
+                for key, trans_key, unit, state_class, device_class, _ in _sensor_definitions(phases)
+            ]
+            payloads = [_payload(charger) for _ in range(iterations)]
+            update_samples, read_samples = [], []
+            for payload in payloads:
+                started = time.perf_counter()
+                coordinator.data = payload
+                coordinator.async_update_listeners()
+                update_samples.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                for sensor in sensors:
+                    sensor.native_value
+                read_samples.append(time.perf_counter() - started)
+            results[layout] = {"decode": _summary(update_samples), "native_value_all": _summary(read_samples)}
+        finally:
+            await coordinator.async_shutdown()
+    return results
+
+
+async def bench_fanout(hass: HomeAssistant, iterations: int) -> dict:
+    """Розсилка одного оновлення всім сутностям парку (без запису в state machine)."""
+    results = {}
+    for layout, phases in LAYOUTS.items():
+        for size in FLEET_SIZES:
+            fleet = []
+            try:
+                for index in range(size):
+                    host = f"127.0.0.{index + 1}:1"
+                    entry = _make_entry(host, layout)
+                    coordinator = _offline_coordinator(hass, host, entry)
+                    fleet.append((coordinator, SimulatedCharger(phases, seed=index)))
+                    for key, trans_key, unit, state_class, device_class, _ in _sensor_definitions(phases):
+                        sensor = EVSESensor(coordinator, entry, key, trans_key, unit, state_class, device_class)
+                        # Замість async_write_ha_state — лише обчислення значення
+                        coordinator.async_add_listener(lambda s=sensor: s.native_value, sensor.coordinator_context)
+
+                payloads = [[_payload(charger) for _, charger in fleet] for _ in range(iterations)]
+                samples = []
+                for cycle in payloads:
+                    started = time.perf_counter()
+                    for (coordinator, _), payload in zip(fleet, cycle):
+                        coordinator.data = payload
+                        coordinator.async_update_listeners()
+                    samples.append(time.perf_counter() - started)
+                results[f"{layout}_x{size}"] = _summary(samples)
+            finally:
+                for coordinator, _ in fleet:
+                    coordinator._listeners.clear()
+                    await coordinator.async_shutdown()
+    return results
+
+
+async def bench_commands(hass: HomeAssistant, iterations: int) -> dict:
+    """Час від постановки запису в чергу до відповіді станції."""
+    servers = await start_fleet(1, 18910, FaultConfig(), seed=3)
+    coordinator = EVSECoordinator(hass, servers[0].address, _make_entry(servers[0].address, "1_phase"))
+    # Без обмеження частоти — міряємо сам шлях запису, а не token bucket
+    coordinator.commands._rate = coordinator.commands._burst = 1e9
+    coordinator.commands._tokens = 1e9
+    results = {}
+    try:
+        for name, send in (
+            ("pageEvent", lambda i: coordinator.commands.async_page_event("currentSet", 6 + i % 10, refresh=False)),
+            ("timer", lambda i: coordinator.commands.async_post_timer(
+                f"isAlarm=false&startTime=2{i % 4}:00&stopTime=07:00&timeZone=2", refresh=False)),
+        ):
+            samples = []
+            for index in range(iterations):
+                started = time.perf_counter()
+                await send(index)
+                samples.append(time.perf_counter() - started)
+            results[name] = _summary(samples)
+    finally:
+        await coordinator.async_shutdown()
+        await stop_fleet(servers)
+    return results
+
+
+def _flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif key.endswith("_us"):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Метрики, що стали повільнішими за baseline більше ніж на threshold (частка)."""
+    regressions = []
+    current_flat = _flatten(current["results"])
+    for name, old in _flatten(baseline["results"]).items():
+        new = current_flat.get(name)
+        if new is None or old <= 0 or not name.endswith("p50_us"):
+            continue
+        if new > old * (1 + threshold):
+            regressions.append(f"{name}: {old} → {new} мкс (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    random.seed(0)
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="evse_bench_"))
+    try:
+        results = {
+            "poll": await bench_poll(hass, args.iterations),
+            "decode": await bench_decode(hass, args.iterations),
+            "fanout": await bench_fanout(hass, max(10, args.iterations // 10)),
+            "commands": await bench_commands(hass, args.iterations),
+        }
+    finally:
+        await hass.async_stop(force=True)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": args.iterations,
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки EVSE Energy Star")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"))
+    parser.add_argument("--baseline", type=Path, help="попередній JSON для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустиме сповільнення p50, частка")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Результати: {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print("Регресії продуктивності:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Регресій немає")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""Локальний імітатор зарядних станцій Energy Star / Eveus для навантажувального тестування.
+
+Реалізує /init, /main (getState), /pageEvent (form-encoded + заголовок pageEvent)
+і /timer, проходить через стани STATUS_MAP і вміє вносити затримки, обриви
+зʼєднань, не-JSON відповіді та повільні тіла. Один процес обслуговує N станцій
+на послідовних портах:
+
+    python tools/evse_simulator.py --chargers 10 --base-port 18000 --latency 50 --jitter 20
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qsl
+from aiohttp import web
+
+_LOGGER = logging.getLogger("evse_simulator")
+
+# Коди станів, як у custom_components/evse_energy_star/const.py → STATUS_MAP
+STATE_CHARGING = 6
+STATE_WAITING = 9
+STATE_READY = 12
+STATE_DELAYED_START = 13
+FAULT_STATES = (14, 15, 16, 18, 20, 21, 22)
+
+INIT_KEYS = ("fwVersion", "timeZone", "startTime", "stopTime", "isAlarm", "curDesign", "aiVoltage")
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    drop_rate: float = 0.0
+    non_json_rate: float = 0.0
+    slow_body_rate: float = 0.0
+    slow_body_ms: float = 2000.0
+    fault_rate: float = 0.0
+
+
+class SimulatedCharger:
+    """Стан однієї станції: налаштування (/init) і вимірювання (/main)."""
+
+    def __init__(self, phases: int = 1, seed: int | None = None, speed: float = 1.0):
+        self.phases = phases
+        self.speed = speed
+        self.random = random.Random(seed)
+        self.config = {
+            "fwVersion": "sim-1.0",
+            "timeZone": 2,
+            "startTime": "23:00",
+            "stopTime": "07:00",
+            "isAlarm": False,
+            "curDesign": 32,
+            "aiVoltage": 200,
+        }
+        self.live = {
+            "state": STATE_WAITING,
+            "currentSet": 16,
+            "evseEnabled": 1,
+            "oneCharge": 0,
+            "aiStatus": 0,
+            "groundCtrl": 1,
+            "ground": 1,
+            "leakValue": 0,
+            "temperature1": 25,
+            "temperature2": 24,
+            "sessionTime": 0,
+            "sessionEnergy": 0,
+            "totalEnergy": 12345,
+        }
+        # Лічильники енергії в приладі — у десятих кВт·год; тримаємо точну суму окремо
+        self._session_kwh = 0.0
+        self._total_kwh = self.live["totalEnergy"] / 10
+        self._target_kwh = 0.0
+        self._fault_until = 0.0
+        self._charge_now = False
+        self._sim_clock = time.time()
+        self._measure(0.0)
+
+    # ---- модель станів -------------------------------------------------
+
+    def _in_window(self) -> bool:
+        now = time.strftime("%H:%M", time.localtime(self._sim_clock))
+        start, stop = str(self.config["startTime"]), str(self.config["stopTime"])
+        if start <= stop:
+            return start <= now < stop
+        return now >= start or now < stop
+
+    def _start_session(self) -> None:
+        self._session_kwh = 0.0
+        self.live["sessionTime"] = 0
+        self._target_kwh = self.random.uniform(2, 20)
+
+    def _charge_allowed(self) -> bool:
+        if not int(self.live["evseEnabled"]):
+            return False
+        return self._charge_now or not _truthy(self.config["isAlarm"]) or self._in_window()
+
+    def tick(self, dt: float, fault_rate: float = 0.0) -> None:
+        dt *= self.speed
+        self._sim_clock += dt
+        state = self.live["state"]
+        rnd = self.random.random
+
+        if state in FAULT_STATES:
+            if self._sim_clock >= self._fault_until:
+                self.live["state"] = STATE_WAITING
+        elif fault_rate and rnd() < fault_rate * dt:
+            self.live["state"] = self.random.choice(FAULT_STATES)
+            self._fault_until = self._sim_clock + self.random.uniform(5, 30)
+        elif state == STATE_WAITING:
+            # Авто підʼєднали
+            if rnd() < dt / 60:
+                self._start_session()
+                self.live["state"] = STATE_CHARGING if self._charge_allowed() else STATE_DELAYED_START
+        elif state == STATE_DELAYED_START:
+            if self._charge_allowed():
+                self.live["state"] = STATE_CHARGING
+        elif state == STATE_CHARGING:
+            if not self._charge_allowed():
+                self.live["state"] = STATE_DELAYED_START
+            elif self._session_kwh >= self._target_kwh:
+                self.live["state"] = STATE_READY
+                self._charge_now = False
+        elif state == STATE_READY:
+            # Авто відʼєднали
+            if rnd() < dt / 120:
+                self.live["state"] = STATE_WAITING
+
+        self._measure(dt)
+
+    def _measure(self, dt: float) -> None:
+        charging = self.live["state"] == STATE_CHARGING
+        amps = float(self.live["currentSet"]) * self.random.uniform(0.95, 1.0) if charging else 0.0
+        volts = [230 + self.random.uniform(-4, 4) for _ in range(self.phases)]
+        power_kw = sum(v * amps for v in volts) / 1000
+
+        if charging:
+            self._session_kwh += power_kw * dt / 3600
+            self._total_kwh += power_kw * dt / 3600
+            self.live["sessionTime"] = int(self.live["sessionTime"] + dt)
+
+        # Масштаби як очікує інтеграція: curMeas1 і енергія — у десятих
+        self.live["curMeas1"] = round(amps * 10)
+        self.live["voltMeas1"] = round(volts[0])
+        if self.phases == 3:
+            self.live["curMeas2"] = round(amps, 1)
+            self.live["curMeas3"] = round(amps, 1)
+            self.live["voltMeas2"] = round(volts[1])
+            self.live["voltMeas3"] = round(volts[2])
+        self.live["sessionEnergy"] = round(self._session_kwh * 10)
+        self.live["totalEnergy"] = round(self._total_kwh * 10)
+        self.live["temperature1"] = round(25 + amps * 0.4 + self.random.uniform(-0.5, 0.5))
+        self.live["temperature2"] = round(24 + amps * 0.6 + self.random.uniform(-0.5, 0.5))
+        self.live["leakValue"] = self.random.choice((0, 0, 0, 1)) if charging else 0
+        self.live["systemTime"] = time.strftime("%H:%M:%S", time.localtime(self._sim_clock))
+
+    # ---- API станції ---------------------------------------------------
+
+    def init_payload(self) -> dict:
+        return {**self.config, **{k: self.live[k] for k in ("currentSet", "groundCtrl")}}
+
+    def main_payload(self) -> dict:
+        return {**self.live, "aiVoltage": self.config["aiVoltage"]}
+
+    def page_event(self, key: str, value: str) -> None:
+        if key == "chargeNow":
+            self._charge_now = True
+            if self.live["state"] == STATE_WAITING:
+                self._start_session()
+            if self.live["state"] in (STATE_WAITING, STATE_DELAYED_START):
+                self.live["state"] = STATE_CHARGING
+        elif key == "aiMode":
+            self.live["aiStatus"] = int(value)
+        elif key == "currentSet":
+            self.live["currentSet"] = max(6, min(int(float(value)), int(self.config["curDesign"])))
+        elif key in self.config:
+            self.config[key] = _coerce(value)
+        else:
+            self.live[key] = _coerce(value)
+
+    def timer(self, fields: dict) -> None:
+        for key in ("startTime", "stopTime", "timeZone"):
+            if key in fields:
+                self.config[key] = _coerce(fields[key])
+        if "isAlarm" in fields:
+            self.config["isAlarm"] = _truthy(fields["isAlarm"])
+
+
+def _truthy(value) -> bool:
+    return str(value).lower() in ("true", "1")
+
+
+def _coerce(value: str):
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+class ChargerServer:
+    """HTTP-обгортка над SimulatedCharger з внесенням збоїв."""
+
+    def __init__(self, charger: SimulatedCharger, port: int, faults: FaultConfig, host: str = "127.0.0.1"):
+        self.charger = charger
+        self.port = port
+        self.host = host
+        self.faults = faults
+        self.requests = 0
+        self._runner: web.AppRunner | None = None
+        self._ticker: asyncio.Task | None = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/init", self._handle_init)
+        app.router.add_post("/main", self._handle_main)
+        app.router.add_post("/pageEvent", self._handle_page_event)
+        app.router.add_post("/timer", self._handle_timer)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._ticker = asyncio.create_task(self._tick_loop())
+
+    async def stop(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _tick_loop(self) -> None:
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            self.charger.tick(now - last, self.faults.fault_rate)
+            last = now
+
+    async def _respond(self, request: web.Request, payload) -> web.StreamResponse:
+        self.requests += 1
+        faults = self.faults
+        rnd = self.charger.random.random
+        delay = faults.latency_ms + faults.jitter_ms * (2 * rnd() - 1)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if rnd() < faults.drop_rate:
+            request.transport.abort()
+            return web.Response(status=500)
+
+        if payload is None:
+            return web.Response(text="OK")
+
+        if rnd() < faults.non_json_rate:
+            return web.Response(text="<html>busy</html>", content_type="text/html")
+
+        body = json.dumps(payload).encode()
+        if rnd() < faults.slow_body_rate:
+            resp = web.StreamResponse(headers={"Content-Type": "application/json"})
+            resp.content_length = len(body)
+            await resp.prepare(request)
+            chunks = [body[i:i + 64] for i in range(0, len(body), 64)]
+            for chunk in chunks:
+                await asyncio.sleep(faults.slow_body_ms / 1000 / len(chunks))
+                await resp.write(chunk)
+            await resp.write_eof()
+            return resp
+
+        return web.Response(body=body, content_type="application/json")
+
+    async def _handle_init(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, self.charger.init_payload())
+
+    async def _handle_main(self, request: web.Request) -> web.StreamResponse:
+        try:
+            body = await request.json()
+        except ValueError:
+            body = {}
+        if not body.get("getState"):
+            return web.Response(status=400, text="getState expected")
+        return await self._respond(request, self.charger.main_payload())
+
+    async def _handle_page_event(self, request: web.Request) -> web.StreamResponse:
+        fields = dict(parse_qsl(await request.text(), keep_blank_values=True))
+        if len(fields) != 1:
+            return web.Response(status=400, text="one key=value expected")
+        key, value = next(iter(fields.items()))
+        header = request.headers.get("pageEvent")
+        if header is not None and header != key:
+            return web.Response(status=400, text="pageEvent header mismatch")
+        self.charger.page_event(key, value)
+        return await self._respond(request, None)
+
+    async def _handle_timer(self, request: web.Request) -> web.StreamResponse:
+        self.charger.timer(dict(parse_qsl(await request.text(), keep_blank_values=True)))
+        return await self._respond(request, None)
+
+
+async def start_fleet(count: int, base_port: int, faults: FaultConfig, phases: int = 1,
+                      speed: float = 1.0, seed: int | None = None) -> list[ChargerServer]:
+    servers = []
+    for index in range(count):
+        charger = SimulatedCharger(phases, None if seed is None else seed + index, speed)
+        server = ChargerServer(charger, base_port + index, faults)
+        await server.start()
+        servers.append(server)
+    return servers
+
+
+async def stop_fleet(servers: list[ChargerServer]) -> None:
+    await asyncio.gather(*(server.stop() for server in servers))
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Імітатор станцій EVSE Energy Star")
+    parser.add_argument("--chargers", type=int, default=1, help="кількість станцій")
+    parser.add_argument("--base-port", type=int, default=18000, help="порт першої станції")
+    parser.add_argument("--phases", type=int, choices=(1, 3), default=1)
+    parser.add_argument("--speed", type=float, default=1.0, help="прискорення часу моделі")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0.0, help="затримка відповіді, мс")
+    parser.add_argument("--jitter", type=float, default=0.0, help="розкид затримки, ± мс")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="частка обірваних зʼєднань")
+    parser.add_argument("--non-json-rate", type=float, default=0.0, help="частка не-JSON відповідей")
+    parser.add_argument("--slow-body-rate", type=float, default=0.0, help="частка повільних тіл")
+    parser.add_argument("--slow-body-ms", type=float, default=2000.0, help="тривалість повільного тіла, мс")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="аварій на секунду моделі")
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    faults = FaultConfig(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        drop_rate=args.drop_rate,
+        non_json_rate=args.non_json_rate,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_ms=args.slow_body_ms,
+        fault_rate=args.fault_rate,
+    )
+    servers = await start_fleet(args.chargers, args.base_port, faults, args.phases, args.speed, args.seed)
+    _LOGGER.info("Запущено %s станцій: %s … %s", len(servers), servers[0].address, servers[-1].address)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_fleet(servers)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(_main(_parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,99 @@
+"""Відтворення записаного трасування через повний стек сутностей.
+
+Трасування пише сама інтеграція (опція «Записувати сирий трафік»):
+config/evse_energy_star_trace_<пристрій>.jsonl.gz (+ ротовані .1, .2 …).
+Скрипт проганяє записані /init і /main через EVSECoordinator і всі
+сенсори — без мережі, з реальною чи прискореною швидкістю — і друкує
+час циклів, кількість змін кожного сенсора та помилки декодування:
+
+    python tools/replay.py trace.jsonl.gz --speed 0
+    python tools/replay.py trace.jsonl.gz --speed 10 --device-type 3_phase --output replay.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmark import _make_entry, _sensor_definitions, _summary  # noqa: E402
+from custom_components.evse_energy_star.breaker import EVSECircuitBreaker  # noqa: E402
+from custom_components.evse_energy_star.coordinator import EVSECoordinator  # noqa: E402
+from custom_components.evse_energy_star.sensor import EVSESensor  # noqa: E402
+from custom_components.evse_energy_star.trace import EVSEReplayClient, read_trace  # noqa: E402
+
+
+async def replay(path: str, speed: float, device_type: str) -> dict:
+    records = read_trace(path)
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="evse_replay_"))
+    try:
+        entry = _make_entry("replay", device_type)
+        coordinator = EVSECoordinator(hass, "replay", entry, client=EVSEReplayClient(hass, records, speed))
+        # Записані збої відтворюються як є, без пауз запобіжника між ними
+        coordinator.breaker = EVSECircuitBreaker("replay", threshold=float("inf"), base=0, maximum=0)
+        phases = 3 if device_type == "3_phase" else 1
+        sensors = [
+            EVSESensor(coordinator, entry, key, trans_key, unit, state_class, device_class)
+            for key, trans_key, unit, state_class, device_class, _ in _sensor_definitions(phases)
+        ]
+        changes = {sensor._key: 0 for sensor in sensors}
+        last = {}
+        samples, failures = [], 0
+
+        while not coordinator.client.exhausted:
+            # /init — тоді ж, коли його опитала станція під час запису
+            if coordinator.client.next_path == "init":
+                coordinator.request_init_refresh()
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            for sensor in sensors:
+                value = sensor.native_value
+                if sensor._key in last and last[sensor._key] != value:
+                    changes[sensor._key] += 1
+                last[sensor._key] = value
+            samples.append(time.perf_counter() - started)
+            if not coordinator.last_update_success:
+                failures += 1
+
+        await coordinator.async_shutdown()
+    finally:
+        await hass.async_stop(force=True)
+
+    return {
+        "trace": path,
+        "records": len(records),
+        "polls": len(samples),
+        "failed_polls": failures,
+        "poll": _summary(samples) if samples else None,
+        "sensor_changes": changes,
+        "metrics": coordinator.metrics.as_dict(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Відтворення трасування EVSE Energy Star")
+    parser.add_argument("trace", help="файл трасування (.jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=0.0, help="множник швидкості; 0 — без очікування")
+    parser.add_argument("--device-type", choices=("1_phase", "3_phase"), default="1_phase")
+    parser.add_argument("--output", type=Path, help="зберегти звіт у JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(replay(args.trace, args.speed, args.device_type))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+    return 0 if report["polls"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())